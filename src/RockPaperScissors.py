@@ -1,7 +1,15 @@
 import random
 import csv
 import os
+import sys
 from collections import Counter
+from pathlib import Path
+
+# Agregar el directorio src al path para importar los modulos hermanos
+sys.path.insert(0, str(Path(__file__).parent))
+
+from registro import anexar_sesion
+from perfiles import AlmacenPerfiles, Perfil
 
 # --- Constantes y Lógica del Juego ---
 
@@ -12,6 +20,10 @@ REGLAS_VICTORIA = {
     'tijera': 'papel'
 }
 
+# Olvido de la matriz de transición: cada ronda las cuentas pierden esta
+# fracción de su peso (0 = no olvida nunca)
+DECAIMIENTO_MARKOV = 0.0
+
 
 # --- Lógica de la IA (Markov de 2do Orden) ---
 
@@ -32,17 +44,23 @@ def encontrar_movimiento_ganador(movimiento_a_vencer):
         return 'piedra'
 
 
-def obtener_eleccion_ia(historial_usuario, transition_matrix):
+def obtener_eleccion_ia(historial_usuario, transition_matrix, prior=None):
     # Rondas mínimas necesarias para usar el modelo de 2do orden
     MIN_MARKOV_ROUNDS = 4
+    # Con perfil guardado la matriz ya trae cuentas de sesiones anteriores
+    if prior:
+        MIN_MARKOV_ROUNDS = 2
+
+    # Frecuencias del jugador: las de sesiones anteriores (prior) + las de esta
+    conteo_movimientos = Counter(prior or {})
+    conteo_movimientos.update(historial_usuario)
 
     # 1. Estrategia de arranque
     if len(historial_usuario) < MIN_MARKOV_ROUNDS:
-        if len(historial_usuario) < 3:
+        if len(historial_usuario) < 3 and not prior:
             return random.choice(OPCIONES)
 
         # Predecir el movimiento más común de las primeras rondas
-        conteo_movimientos = Counter(historial_usuario)
         prediccion_usuario = conteo_movimientos.most_common(1)[0][0]
         return encontrar_movimiento_ganador(prediccion_usuario)
 
@@ -64,7 +82,6 @@ def obtener_eleccion_ia(historial_usuario, transition_matrix):
 
     if prediccion_usuario is None:
         # 3. Fallback: Si la secuencia es nueva o no hay datos, usar el movimiento más común de todo el historial.
-        conteo_movimientos = Counter(historial_usuario)
         prediccion_usuario = conteo_movimientos.most_common(1)[0][0]
 
     return encontrar_movimiento_ganador(prediccion_usuario)
@@ -124,8 +141,21 @@ def guardar_resultados_csv(historial_partidas):
 
 # --- Función Principal ---
 
-def jugar_partida():
+def jugar_partida(decaimiento=DECAIMIENTO_MARKOV, jugador=None):
     print("=== PIEDRA, PAPEL, TIJERA (IA MARKOV 2DO ORDEN) ===")
+
+    if jugador is None:
+        jugador = input("Tu nombre (ENTER para jugar sin perfil): ").strip()
+
+    # Perfil de sesiones anteriores del jugador
+    perfil = Perfil()
+    if jugador:
+        with AlmacenPerfiles() as almacen:
+            perfil = almacen.cargar(jugador)
+        if not perfil.vacio:
+            print(f"Perfil de {jugador}: {int(perfil.datos['sesiones'])} sesiones, "
+                  f"{int(perfil.datos['rondas'])} rondas.")
+
     print("Escribe 'salir' para terminar.")
 
     datos_para_csv = []
@@ -134,7 +164,11 @@ def jugar_partida():
     historial_movimientos_ia = []
 
     # Matriz de Transición de 2do orden: Clave = (Jugada_n-2, Jugada_n-1)
-    transition_matrix = {}
+    # (arranca con las cuentas del perfil, vacía si no hay)
+    transition_matrix = perfil.matriz_transicion()
+    prior = perfil.prior_frecuencias()
+    # Ronda en la que se actualizó cada clave por última vez (para el olvido)
+    ultima_actualizacion = {key: 0 for key in transition_matrix}
 
     # last_user_move ya no es necesario, el historial completo se usa para la predicción
     # last_user_move = None
@@ -165,7 +199,7 @@ def jugar_partida():
             continue
 
         # Turno IA: Solo se pasa el historial y la matriz de transición
-        jugada_j2 = obtener_eleccion_ia(historial_movimientos_usuario, transition_matrix)
+        jugada_j2 = obtener_eleccion_ia(historial_movimientos_usuario, transition_matrix, prior)
 
         # Ganador
         ganador = determinar_ganador(jugada_j1, jugada_j2)
@@ -228,8 +262,15 @@ def jugar_partida():
 
             if key not in transition_matrix:
                 transition_matrix[key] = {'piedra': 0, 'papel': 0, 'tijera': 0}
+            elif decaimiento > 0:
+                # Olvido perezoso: se aplica de golpe el decaimiento de las
+                # rondas transcurridas desde la última actualización (O(1))
+                factor = (1 - decaimiento) ** (ronda_actual - ultima_actualizacion[key])
+                for movimiento in transition_matrix[key]:
+                    transition_matrix[key][movimiento] *= factor
 
             transition_matrix[key][next_move] += 1
+            ultima_actualizacion[key] = ronda_actual
         # ----------------------------------------------------
 
         # Calcular estadísticas evolutivas (acumulativas hasta esta ronda)
@@ -264,6 +305,13 @@ def jugar_partida():
     if datos_para_csv:
         print("\n--- Guardando partida ---")
         guardar_resultados_csv(datos_para_csv)
+        anexar_sesion(datos_para_csv, 'jugar_partida')
+
+        if jugador:
+            with AlmacenPerfiles() as almacen:
+                almacen.fusionar(jugador, Perfil.desde_sesion(historial_movimientos_usuario,
+                                                              historial_movimientos_ia))
+            print(f"Perfil de {jugador} actualizado.")
     else:
         print("No se generaron datos.")
 
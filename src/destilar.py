@@ -0,0 +1,157 @@
+"""
+RPSAI - Destilado del Modelo en Tabla
+=====================================
+
+Convierte el modelo entrenado en una tabla densa de NumPy sobre el
+espacio discreto de features, para jugar sin sklearn y con decisiones
+de coste constante.
+
+Uso:
+    python src/destilar.py
+
+El destilado:
+1. Carga el modelo entrenado (models/modelo_entrenado/ o el .pkl antiguo)
+2. Predice todas las celdas de la tabla en paralelo
+3. Guarda la tabla junto al modelo (models/modelo_entrenado.npy) y sus
+   metadatos (modelo de origen, resolucion y olvido) en
+   models/modelo_entrenado.json
+"""
+
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+# Agregar el directorio src al path para importar modelo
+sys.path.insert(0, str(Path(__file__).parent))
+
+from modelo import (cargar_modelo, forma_tabla, predecir_celdas, ruta_modelo_por_defecto,
+                    RESOLUCION_FRECUENCIAS, RUTA_TABLA, VENTANA_FRECUENCIAS,
+                    DECAIMIENTO_FRECUENCIAS)
+from jugador import ruta_metadatos_tabla
+
+
+# Modelo cargado en cada proceso del pool
+_modelo_proceso = None
+
+
+def _iniciar_proceso(ruta_modelo: str):
+    """Carga el modelo una vez por proceso del pool."""
+    global _modelo_proceso
+    _modelo_proceso = cargar_modelo(ruta_modelo)
+
+
+def _predecir_bloque(args: tuple) -> tuple:
+    """Predice un bloque de celdas en un proceso del pool."""
+    inicio, fin, resolucion = args
+    return inicio, predecir_celdas(_modelo_proceso, inicio, fin, resolucion)
+
+
+def guardar_metadatos_tabla(ruta_tabla: str, modelo, ruta_modelo: str, resolucion: int):
+    """
+    Escribe junto a la tabla el JSON con el modelo de origen, la
+    resolución y el olvido de las frecuencias con que se entrenó.
+    """
+    metadatos = getattr(modelo, "metadatos", {})
+    estadisticas = metadatos.get("estadisticas") or {"ventana": VENTANA_FRECUENCIAS,
+                                                     "decaimiento": DECAIMIENTO_FRECUENCIAS}
+    contenido = {
+        "huella": getattr(modelo, "huella", None),
+        "modelo": str(ruta_modelo),
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "resolucion": resolucion,
+        "estadisticas": estadisticas,
+    }
+
+    ruta = ruta_metadatos_tabla(ruta_tabla)
+    temporal = ruta.with_name(ruta.name + ".tmp")
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(contenido, f, indent=2, ensure_ascii=False)
+    os.replace(temporal, ruta)
+
+
+def destilar_modelo(ruta_modelo: str = None, ruta_tabla: str = None,
+                    resolucion: int = RESOLUCION_FRECUENCIAS,
+                    procesos: int = None, tam_bloque: int = 100_000) -> np.ndarray:
+    """
+    Destila el modelo en una tabla densa y la guarda como .npy.
+
+    Args:
+        ruta_modelo: Modelo a destilar (por defecto el entrenado)
+        ruta_tabla: Fichero .npy de salida (por defecto junto al modelo)
+        resolucion: Resolucion de cuantizacion de las frecuencias
+        procesos: Numero de procesos (por defecto, todos los nucleos)
+        tam_bloque: Celdas predichas por tarea
+    """
+    if ruta_modelo is None:
+        ruta_modelo = ruta_modelo_por_defecto()
+    if ruta_tabla is None:
+        ruta_tabla = RUTA_TABLA
+
+    if not os.path.exists(ruta_modelo):
+        raise FileNotFoundError(f"No se encontró el modelo en: {ruta_modelo}")
+
+    modelo = cargar_modelo(ruta_modelo)
+    forma = forma_tabla(resolucion)
+    total = int(np.prod(forma))
+    bloques = [(inicio, min(inicio + tam_bloque, total), resolucion)
+               for inicio in range(0, total, tam_bloque)]
+
+    print(f"Destilando {total} celdas en {len(bloques)} bloques...")
+    t0 = time.perf_counter()
+
+    # Se escribe en un fichero temporal y se sustituye el final de una vez:
+    # quien ya tenga la tabla abierta sigue leyendo la anterior y un
+    # destilado a medias nunca queda en la ruta final
+    temporal = Path(ruta_tabla).with_name(Path(ruta_tabla).name + ".tmp")
+    try:
+        tabla = np.lib.format.open_memmap(temporal, mode="w+", dtype=np.int8, shape=forma)
+        plana = tabla.reshape(-1)
+
+        with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_proceso,
+                                 initargs=(str(ruta_modelo),)) as pool:
+            for inicio, predicciones in pool.map(_predecir_bloque, bloques):
+                plana[inicio:inicio + len(predicciones)] = predicciones
+
+        tabla.flush()
+        del tabla, plana  # cerrar el mapeo antes de renombrar (Windows)
+        os.replace(temporal, ruta_tabla)
+        guardar_metadatos_tabla(ruta_tabla, modelo, ruta_modelo, resolucion)
+    finally:
+        if temporal.exists():
+            temporal.unlink()
+
+    tabla = np.load(ruta_tabla, mmap_mode="r")
+    print(f"✓ Tabla destilada en {time.perf_counter() - t0:.1f}s "
+          f"({tabla.nbytes / 1024:.0f} KB)")
+    print(f"✓ Tabla guardada en: {ruta_tabla}")
+    return tabla
+
+
+def main():
+    """Funcion principal."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Destila el modelo en una tabla de consulta")
+    parser.add_argument("-r", "--resolucion", type=int, default=RESOLUCION_FRECUENCIAS,
+                        help=f"Resolucion de las frecuencias (default: {RESOLUCION_FRECUENCIAS})")
+    parser.add_argument("-p", "--procesos", type=int, default=None,
+                        help="Numero de procesos (default: todos los nucleos)")
+    parser.add_argument("--modelo", default=None, help="Ruta del modelo a destilar")
+    parser.add_argument("--salida", default=None, help="Ruta del fichero .npy de salida")
+    args = parser.parse_args()
+
+    try:
+        destilar_modelo(args.modelo, args.salida, args.resolucion, args.procesos)
+    except FileNotFoundError as e:
+        print(f"\n❌ Error: {e}")
+        print("\nEntrena tu modelo primero con: python src/modelo.py")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+RPSAI - Estadisticas del Oponente con Olvido
+============================================
+
+Frecuencias de jugadas del oponente en tres modos:
+
+- acumulado: todas las jugadas pesan igual (comportamiento original)
+- ventana: solo cuentan las ultimas N jugadas
+- decaimiento: media exponencial, cada jugada pesa (1 - alpha) menos
+  que la siguiente
+
+ContadorFrecuencias es la version en vivo (actualizacion O(1) y memoria
+fija); frecuencias_lote calcula lo mismo para toda una partida de una
+vez, para crear las features de entrenamiento.
+"""
+
+from collections import deque
+
+import numpy as np
+
+
+def validar_modo(ventana: int = None, decaimiento: float = None):
+    """Comprueba que los parametros de olvido son coherentes."""
+    if ventana is not None and decaimiento is not None:
+        raise ValueError("Usa ventana o decaimiento, no ambos")
+    if ventana is not None and ventana < 1:
+        raise ValueError(f"La ventana debe ser >= 1: {ventana}")
+    if decaimiento is not None and not 0 < decaimiento < 1:
+        raise ValueError(f"El decaimiento debe estar entre 0 y 1: {decaimiento}")
+
+
+class ContadorFrecuencias:
+    """
+    Frecuencias de piedra, papel y tijera con actualizacion O(1).
+
+    Args:
+        ventana: Numero de jugadas recientes a considerar
+        decaimiento: Tasa alpha de la media exponencial
+    """
+
+    def __init__(self, ventana: int = None, decaimiento: float = None):
+        validar_modo(ventana, decaimiento)
+        self.ventana = ventana
+        self.decaimiento = decaimiento
+        self.total = 0
+        self._pesos = np.zeros(3)
+        self._peso_total = 0.0
+        self._recientes = deque(maxlen=ventana) if ventana is not None else None
+
+    def vacio(self) -> "ContadorFrecuencias":
+        """Contador nuevo con la misma configuracion."""
+        return ContadorFrecuencias(self.ventana, self.decaimiento)
+
+    def actualizar(self, jugada: int):
+        """Registra una jugada (0=piedra, 1=papel, 2=tijera)."""
+        self.total += 1
+
+        if self.decaimiento is not None:
+            self._pesos *= 1 - self.decaimiento
+            self._peso_total = (1 - self.decaimiento) * self._peso_total + self.decaimiento
+            self._pesos[jugada] += self.decaimiento
+            return
+
+        if self._recientes is not None and len(self._recientes) == self.ventana:
+            self._pesos[self._recientes[0]] -= 1
+            self._peso_total -= 1
+            self._recientes.popleft()
+        if self._recientes is not None:
+            self._recientes.append(jugada)
+
+        self._pesos[jugada] += 1
+        self._peso_total += 1
+
+    def frecuencias(self) -> np.ndarray:
+        """Frecuencia de cada jugada (suman 1 si hay alguna jugada)."""
+        if self._peso_total == 0:
+            return np.full(3, 1 / 3)
+        return self._pesos / self._peso_total
+
+
+def filtro_exponencial(x: np.ndarray, decaimiento: float) -> np.ndarray:
+    """
+    Media exponencial s_t = (1 - a) s_{t-1} + a x_t a lo largo del eje 0.
+
+    Dentro de un bloque la recurrencia es una suma acumulada escalada:
+    s_j = r^j (r s_previo + a * sum_i x_i r^-i), con r = 1 - a. Los
+    bloques se limitan para que r^-i no desborde.
+    """
+    r = 1 - decaimiento
+    tam_bloque = max(1, int(100 * np.log(10) / -np.log(r)))
+
+    salida = np.empty_like(x, dtype=float)
+    estado = np.zeros(x.shape[1:])
+    for inicio in range(0, len(x), tam_bloque):
+        bloque = x[inicio:inicio + tam_bloque]
+        k = np.arange(len(bloque)).reshape((-1,) + (1,) * (x.ndim - 1))
+        suma = np.cumsum(bloque * r ** -k, axis=0)
+        salida[inicio:inicio + len(bloque)] = r ** k * (r * estado + decaimiento * suma)
+        estado = salida[inicio + len(bloque) - 1]
+    return salida
+
+
+def frecuencias_lote(jugadas, ventana: int = None, decaimiento: float = None) -> np.ndarray:
+    """
+    Frecuencias tras cada jugada de la secuencia, en lote.
+
+    La fila t incluye la jugada t, igual que ContadorFrecuencias tras
+    actualizar con ella.
+
+    Returns:
+        Array (n, 3) con las frecuencias de piedra, papel y tijera
+    """
+    validar_modo(ventana, decaimiento)
+    jugadas = np.asarray(jugadas, dtype=np.intp)
+    n = len(jugadas)
+    one_hot = np.zeros((n, 3))
+    one_hot[np.arange(n), jugadas] = 1
+
+    if decaimiento is not None:
+        # s_t = (1 - a) s_{t-1} + a x_t, normalizado por el peso acumulado
+        pesos = filtro_exponencial(one_hot, decaimiento)
+        peso_total = 1 - (1 - decaimiento) ** np.arange(1, n + 1)
+        return pesos / peso_total[:, None]
+
+    acumulado = np.cumsum(one_hot, axis=0)
+    longitud = np.arange(1, n + 1)
+
+    if ventana is not None and n > ventana:
+        acumulado[ventana:] -= acumulado[:-ventana].copy()
+        longitud = np.minimum(longitud, ventana)
+
+    return acumulado / longitud[:, None]
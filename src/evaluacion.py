@@ -0,0 +1,185 @@
+"""
+RPSAI - Metricas de Evaluacion Vectorizadas
+===========================================
+
+Metricas para comparar modelos mas alla de la accuracy de un unico
+corte:
+
+- winrate esperado: victorias / decisivas jugando PIERDE_CONTRA[pred]
+- log-loss de predict_proba
+- accuracy por fase de la partida
+
+Todas se calculan en lote con NumPy para muchos candidatos y muchos
+grupos (folds o sesiones) a la vez: las probabilidades llegan como un
+array (candidatos, rondas, 3) y los grupos como un entero por ronda.
+"""
+
+import numpy as np
+
+# Columna de fase_juego en la matriz de features
+COLUMNA_FASE = 6
+EPSILON = 1e-15
+
+
+def probas_completas(modelo, X) -> np.ndarray:
+    """
+    predict_proba con una columna por jugada (0, 1, 2), aunque el modelo
+    no haya visto alguna clase al entrenar.
+    """
+    X = np.asarray(X)
+    probas = np.zeros((len(X), 3))
+    probas[:, np.asarray(modelo.classes_, dtype=int)] = modelo.predict_proba(X)
+    return probas
+
+
+def resultado_jugadas(prediccion, y) -> tuple:
+    """
+    Victorias y derrotas de la IA al jugar lo que gana a la prediccion.
+
+    La IA juega (pred + 1) % 3: gana si el oponente juega pred y pierde
+    si juega (pred + 2) % 3.
+    """
+    prediccion = np.asarray(prediccion)
+    y = np.asarray(y)
+    return prediccion == y, y == (prediccion + 2) % 3
+
+
+def _sumar_por_grupo(valores: np.ndarray, grupos: np.ndarray, n_grupos: int) -> np.ndarray:
+    """Suma (candidatos, n) por grupo -> (candidatos, n_grupos) con un solo bincount."""
+    n_candidatos = valores.shape[0]
+    indice = np.arange(n_candidatos)[:, None] * n_grupos + grupos[None, :]
+    return np.bincount(indice.ravel(), weights=valores.ravel(),
+                       minlength=n_candidatos * n_grupos).reshape(n_candidatos, n_grupos)
+
+
+def metricas_lote(probas, y, grupos=None, fases=None, tam_bloque: int = 1_000_000) -> dict:
+    """
+    Metricas de muchos candidatos sobre muchos grupos a la vez.
+
+    Args:
+        probas: (candidatos, n, 3) o (n, 3) con las probabilidades
+        y: (n,) jugada real del oponente
+        grupos: (n,) id de fold/sesion (0..G-1); por defecto un solo grupo
+        fases: (n,) fase de la partida (0, 1, 2) para la accuracy por fase
+        tam_bloque: rondas procesadas por bloque (limita la memoria)
+
+    Returns:
+        Dict con arrays (candidatos, G): winrate, accuracy, log_loss,
+        victorias, derrotas, rondas; y accuracy_fase (candidatos, 3)
+        si se indican las fases. Los totales agregados sobre todos los
+        grupos estan en las claves *_total (candidatos,).
+    """
+    probas = np.asarray(probas, dtype=float)
+    if probas.ndim == 2:
+        probas = probas[None]
+    y = np.asarray(y, dtype=np.intp)
+    n_candidatos, n, _ = probas.shape
+
+    grupos = np.zeros(n, dtype=np.intp) if grupos is None else np.asarray(grupos, dtype=np.intp)
+    n_grupos = int(grupos.max()) + 1 if n > 0 else 1
+
+    sumas = {k: np.zeros((n_candidatos, n_grupos))
+             for k in ("victorias", "derrotas", "aciertos", "log_loss", "rondas")}
+    aciertos_fase = np.zeros((n_candidatos, 3))
+    rondas_fase = np.zeros(3)
+
+    for inicio in range(0, n, tam_bloque):
+        p = probas[:, inicio:inicio + tam_bloque]
+        yb = y[inicio:inicio + tam_bloque]
+        gb = grupos[inicio:inicio + tam_bloque]
+
+        prediccion = p.argmax(axis=2)
+        victorias, derrotas = resultado_jugadas(prediccion, yb[None, :])
+        p_real = np.take_along_axis(p, np.broadcast_to(yb[None, :, None], (n_candidatos, len(yb), 1)), axis=2)[..., 0]
+
+        sumas["victorias"] += _sumar_por_grupo(victorias, gb, n_grupos)
+        sumas["derrotas"] += _sumar_por_grupo(derrotas, gb, n_grupos)
+        sumas["aciertos"] += _sumar_por_grupo(prediccion == yb, gb, n_grupos)
+        sumas["log_loss"] += _sumar_por_grupo(-np.log(np.clip(p_real, EPSILON, 1)), gb, n_grupos)
+        sumas["rondas"] += np.bincount(gb, minlength=n_grupos)[None, :]
+
+        if fases is not None:
+            fb = np.asarray(fases[inicio:inicio + tam_bloque], dtype=np.intp)
+            aciertos_fase += _sumar_por_grupo(prediccion == yb, fb, 3)
+            rondas_fase += np.bincount(fb, minlength=3)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        decisivas = sumas["victorias"] + sumas["derrotas"]
+        resultado = {
+            "winrate": sumas["victorias"] / decisivas,
+            "accuracy": sumas["aciertos"] / sumas["rondas"],
+            "log_loss": sumas["log_loss"] / sumas["rondas"],
+            "victorias": sumas["victorias"],
+            "derrotas": sumas["derrotas"],
+            "rondas": sumas["rondas"],
+            "winrate_total": sumas["victorias"].sum(axis=1) / decisivas.sum(axis=1),
+            "accuracy_total": sumas["aciertos"].sum(axis=1) / sumas["rondas"].sum(axis=1),
+            "log_loss_total": sumas["log_loss"].sum(axis=1) / sumas["rondas"].sum(axis=1),
+        }
+        if fases is not None:
+            resultado["accuracy_fase"] = aciertos_fase / rondas_fase
+
+    return resultado
+
+
+def winrate(modelo, X, y) -> float:
+    """
+    Winrate esperado de un modelo sobre unos datos (un solo grupo).
+
+    Devuelve NaN si no hay ninguna ronda decisiva: el winrate no está
+    definido y no debe compararse como si fuera 0.
+    """
+    return float(metricas_lote(probas_completas(modelo, X), y)["winrate_total"][0])
+
+
+def folds_temporales(n: int, test_size: float = 0.2, n_folds: int = 5) -> list:
+    """
+    Folds de origen móvil sobre la cola de los datos.
+
+    La última fracción test_size se divide en n_folds bloques
+    consecutivos; cada bloque se evalúa con un modelo entrenado con todo
+    lo anterior, sin barajar (las partidas son series temporales).
+
+    Returns:
+        Lista de (fin_entrenamiento, fin_test)
+    """
+    inicio_test = int(round(n * (1 - test_size)))
+    n_folds = max(1, min(n_folds, n - inicio_test))
+    cortes = np.linspace(inicio_test, n, n_folds + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(cortes[:-1], cortes[1:]) if b > a]
+
+
+def validacion_temporal(modelos: dict, X, y, test_size: float = 0.2, n_folds: int = 5) -> dict:
+    """
+    Entrena cada modelo en cada fold y evalúa todos los candidatos en lote.
+
+    Args:
+        modelos: nombre -> estimador sin entrenar (se clona en cada fold)
+
+    Returns:
+        Dict de metricas_lote (candidatos en el orden de modelos), más
+        'nombres' y las predicciones fuera de muestra en 'probas' / 'y'
+    """
+    from sklearn.base import clone
+
+    X = np.asarray(X)
+    y = np.asarray(y)
+    folds = folds_temporales(len(X), test_size, n_folds)
+
+    n_test = folds[-1][1] - folds[0][0]
+    probas = np.zeros((len(modelos), n_test, 3))
+    grupos = np.empty(n_test, dtype=np.intp)
+
+    desplazamiento = folds[0][0]
+    for f, (fin_train, fin_test) in enumerate(folds):
+        grupos[fin_train - desplazamiento:fin_test - desplazamiento] = f
+        for c, modelo in enumerate(modelos.values()):
+            ajustado = clone(modelo).fit(X[:fin_train], y[:fin_train])
+            probas[c, fin_train - desplazamiento:fin_test - desplazamiento] = \
+                probas_completas(ajustado, X[fin_train:fin_test])
+
+    y_test = y[desplazamiento:]
+    fases = X[desplazamiento:, COLUMNA_FASE] if X.shape[1] > COLUMNA_FASE else None
+    resultado = metricas_lote(probas, y_test, grupos, fases)
+    resultado.update(nombres=list(modelos), probas=probas, y=y_test)
+    return resultado
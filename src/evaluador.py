@@ -21,7 +21,10 @@ from pathlib import Path
 # Agregar el directorio src al path para importar modelo
 sys.path.insert(0, str(Path(__file__).parent))
 
-from modelo import JugadorIA, JUGADA_A_NUM, NUM_A_JUGADA, GANA_A
+from jugador import JugadorIA, JUGADA_A_NUM, NUM_A_JUGADA, GANA_A, RUTA_TABLA
+from registro import anexar_sesion, filas_de_sesion, nueva_sesion
+from traza import RUTA_TRAZAS
+from perfiles import AlmacenPerfiles
 
 
 # Mapeo de entrada a jugada
@@ -116,12 +119,17 @@ def mostrar_progreso(victorias: int, derrotas: int, empates: int, total: int):
               f"| Quedan: {restantes}")
 
 
-def evaluar(num_rondas: int = 50):
+def evaluar(num_rondas: int = 50, ruta_tabla: str = None, grabar_traza: bool = True,
+            jugador: str = None):
     """
     Ejecuta la evaluacion del modelo.
 
     Args:
         num_rondas: Numero de rondas a jugar
+        ruta_tabla: Tabla destilada a usar en lugar del modelo
+        grabar_traza: Grabar la sesion en data/trazas/ para reproducirla
+        jugador: Nombre del jugador; su perfil se usa al empezar y se
+            actualiza al terminar (ver perfiles.py)
     """
     print("="*60)
     print("   RPSAI - EVALUACION DE WINRATE")
@@ -129,50 +137,79 @@ def evaluar(num_rondas: int = 50):
     print(f"\nSe jugaran {num_rondas} rondas contra tu modelo de IA.")
     print("Juega de forma natural, como lo harias normalmente.\n")
 
+    perfil = None
+    if jugador:
+        with AlmacenPerfiles() as almacen:
+            perfil = almacen.cargar(jugador)
+        if not perfil.vacio:
+            print(f"Perfil de {jugador}: {int(perfil.datos['sesiones'])} sesiones, "
+                  f"acierto historico de la IA {perfil.tasa_aciertos:.1%}\n")
+
     # Intentar cargar el modelo
     try:
-        ia = JugadorIA()
-        if ia.modelo is None:
+        ia = JugadorIA(ruta_tabla=ruta_tabla, perfil=perfil)
+        if ia.modelo is None and ia.tabla is None:
             print("[!] ADVERTENCIA: No se cargo ningun modelo.")
             print("[!] La IA jugara de forma ALEATORIA.")
             print("[!] Entrena tu modelo primero con: python src/modelo.py\n")
     except Exception as e:
         print(f"[!] Error al cargar el modelo: {e}")
         print("[!] La IA jugara de forma ALEATORIA.\n")
-        ia = JugadorIA()
-
-    input("Presiona ENTER para comenzar la evaluacion...")
-
-    victorias = 0
-    derrotas = 0
-    empates = 0
-
-    for ronda in range(1, num_rondas + 1):
-        # La IA decide su jugada
-        jugada_ia = ia.decidir_jugada()
-
-        # El humano juega
-        jugada_humano = leer_jugada_humano()
+        ia = JugadorIA(perfil=perfil)
 
-        # Determinar resultado (desde perspectiva IA)
-        resultado = obtener_resultado(jugada_ia, jugada_humano)
+    # La traza se llama como la sesion del registro, para poder cruzarlas
+    sesion = nueva_sesion()
+    ruta_traza = None
+    if grabar_traza:
+        ruta_traza = RUTA_TRAZAS / f"{sesion}.rpst"
+        ia.iniciar_traza(ruta_traza)
 
-        # Mostrar resultado
-        mostrar_ronda(ronda, jugada_ia, jugada_humano, resultado)
-
-        # Registrar en el historial de la IA
-        ia.registrar_ronda(jugada_humano, jugada_ia)
-
-        # Actualizar contadores
-        if resultado == "victoria":
-            victorias += 1
-        elif resultado == "derrota":
-            derrotas += 1
-        else:
-            empates += 1
-
-        # Mostrar progreso
-        mostrar_progreso(victorias, derrotas, empates, num_rondas)
+    # La traza se cierra aunque la sesion se interrumpa (Ctrl+C, error)
+    try:
+        input("Presiona ENTER para comenzar la evaluacion...")
+
+        victorias = 0
+        derrotas = 0
+        empates = 0
+        jugadas_humano = []
+        jugadas_ia = []
+
+        for ronda in range(1, num_rondas + 1):
+            # La IA decide su jugada
+            jugada_ia = ia.decidir_jugada()
+
+            # El humano juega
+            jugada_humano = leer_jugada_humano()
+
+            # Determinar resultado (desde perspectiva IA)
+            resultado = obtener_resultado(jugada_ia, jugada_humano)
+
+            # Mostrar resultado
+            mostrar_ronda(ronda, jugada_ia, jugada_humano, resultado)
+
+            # Registrar en el historial de la IA
+            ia.registrar_ronda(jugada_humano, jugada_ia)
+            jugadas_humano.append(jugada_humano)
+            jugadas_ia.append(jugada_ia)
+
+            # Actualizar contadores
+            if resultado == "victoria":
+                victorias += 1
+            elif resultado == "derrota":
+                derrotas += 1
+            else:
+                empates += 1
+
+            # Mostrar progreso
+            mostrar_progreso(victorias, derrotas, empates, num_rondas)
+    finally:
+        ia.cerrar_traza()
+
+    # Guardar la sesion en el registro (alimenta el reentrenamiento)
+    anexar_sesion(filas_de_sesion(jugadas_humano, jugadas_ia), 'evaluar', sesion=sesion)
+    if jugador:
+        with AlmacenPerfiles() as almacen:
+            almacen.fusionar(jugador, ia.perfil_sesion())
 
     # Resultados finales
     print("\n" + "="*60)
@@ -190,6 +227,8 @@ def evaluar(num_rondas: int = 50):
     print(f"Derrotas IA: {derrotas}")
     print(f"Empates: {empates}")
     print(f"\nWINRATE DE LA IA: {winrate:.1f}%")
+    if ruta_traza is not None:
+        print(f"Traza de la sesion: {ruta_traza}")
 
     nota, bonus = obtener_nota(winrate)
     print(f"\n{'='*60}")
@@ -212,9 +251,15 @@ def main():
     parser = argparse.ArgumentParser(description="Evalua el winrate de tu modelo de IA")
     parser.add_argument("-n", "--rondas", type=int, default=50,
                         help="Numero de rondas a jugar (default: 50)")
+    parser.add_argument("--tabla", nargs="?", const=str(RUTA_TABLA), default=None,
+                        help="Jugar con la tabla destilada (python src/destilar.py)")
+    parser.add_argument("--sin-traza", action="store_true",
+                        help="No grabar la traza de la sesion")
+    parser.add_argument("-j", "--jugador", default=None,
+                        help="Nombre del jugador (usa y actualiza su perfil)")
     args = parser.parse_args()
 
-    evaluar(args.rondas)
+    evaluar(args.rondas, args.tabla, not args.sin_traza, args.jugador)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,468 @@
+"""
+RPSAI - Jugador de IA
+=====================
+
+JugadorIA y lo necesario para jugar con la tabla destilada. Solo depende
+de NumPy: en modo tabla no se importan pandas ni sklearn (modelo.py solo
+se importa al cargar un modelo).
+"""
+
+import copy
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Agregar el directorio src al path para importar los modulos hermanos
+sys.path.insert(0, str(Path(__file__).parent))
+
+from estadisticas import ContadorFrecuencias
+from evaluacion import probas_completas
+
+RUTA_TABLA = Path(__file__).parent.parent / "models" / "modelo_entrenado.npy"
+
+# Mapeo de jugadas a numeros
+JUGADA_A_NUM = {"piedra": 0, "papel": 1, "tijera": 2}
+NUM_A_JUGADA = {0: "piedra", 1: "papel", 2: "tijera"}
+
+# Que jugada gana a cual
+GANA_A = {"piedra": "tijera", "papel": "piedra", "tijera": "papel"}
+PIERDE_CONTRA = {"piedra": "papel", "papel": "tijera", "tijera": "piedra"}
+
+# Discretizacion de features para la cache y la tabla de predicciones
+NUM_FEATURES = 11
+RESOLUCION_FRECUENCIAS = 10
+MAX_RACHA_TABLA = 3
+
+# Puntuación de la jugada de la IA (fila) contra la del oponente (columna)
+MATRIZ_PAGOS = np.array([
+    [0, -1, 1],   # piedra
+    [1, 0, -1],   # papel
+    [-1, 1, 0],   # tijera
+])
+
+# Por debajo de esta probabilidad máxima la IA empieza a mezclar con azar
+UMBRAL_CONFIANZA = 0.45
+
+
+# =============================================================================
+# TABLA DESTILADA
+# =============================================================================
+
+def cargar_tabla(ruta: str = None) -> np.ndarray:
+    """Abre la tabla destilada en modo memoria mapeada (solo lectura)."""
+    if ruta is None:
+        ruta = RUTA_TABLA
+
+    if not os.path.exists(ruta):
+        raise FileNotFoundError(f"No se encontró la tabla en: {ruta}")
+
+    return np.load(ruta, mmap_mode="r")
+
+
+def ruta_metadatos_tabla(ruta_tabla: str) -> Path:
+    """Fichero JSON con los metadatos de la tabla, junto a ella."""
+    return Path(ruta_tabla).with_suffix(".json")
+
+
+def cargar_metadatos_tabla(ruta_tabla: str = None) -> dict:
+    """
+    Metadatos de la tabla destilada: huella del modelo de origen,
+    resolución y olvido de las frecuencias. Vacío si no existen.
+    """
+    if ruta_tabla is None:
+        ruta_tabla = RUTA_TABLA
+    try:
+        with open(ruta_metadatos_tabla(ruta_tabla), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def forma_tabla(resolucion: int = RESOLUCION_FRECUENCIAS) -> tuple:
+    """
+    Forma de la tabla densa sobre el espacio discreto de features.
+
+    Ejes: freq_piedra, freq_papel, lag1, lag2, lag3, fase, diff,
+    resultado_anterior, racha_victorias, racha_derrotas. La frecuencia de
+    tijera no tiene eje propio: se deduce de las otras dos.
+    """
+    return (resolucion + 1, resolucion + 1, 3, 3, 3, 3, 5, 3,
+            MAX_RACHA_TABLA + 1, MAX_RACHA_TABLA + 1)
+
+
+def indice_tabla(features, resolucion: int = RESOLUCION_FRECUENCIAS) -> int:
+    """
+    Índice plano de la celda de un vector de features, con aritmética
+    entera (equivale a ravel_multi_index(discretizar_lote(...)) sin crear
+    arrays temporales).
+    """
+    f = np.asarray(features, dtype=float).tolist()
+    f += [0.0] * (NUM_FEATURES - len(f))
+
+    valores = (
+        (min(max(round(f[0] * resolucion), 0), resolucion), resolucion + 1),
+        (min(max(round(f[1] * resolucion), 0), resolucion), resolucion + 1),
+        (round(f[3]), 3), (round(f[4]), 3), (round(f[5]), 3), (round(f[6]), 3),
+        (round(f[7]) + 2, 5),
+        (round(f[8]) + 1, 3),
+        (min(max(round(f[9]), 0), MAX_RACHA_TABLA), MAX_RACHA_TABLA + 1),
+        (min(max(round(f[10]), 0), MAX_RACHA_TABLA), MAX_RACHA_TABLA + 1),
+    )
+
+    indice = 0
+    for valor, tam in valores:
+        indice = indice * tam + valor
+    return indice
+
+
+def consultar_tabla(tabla: np.ndarray, features) -> int:
+    """Consulta la predicción de la tabla para un vector de features."""
+    return tabla.item(indice_tabla(features, tabla.shape[0] - 1))
+
+
+# =============================================================================
+# PREDICCION Y JUEGO
+# =============================================================================
+
+def politica_esperada(probas, umbral: float = UMBRAL_CONFIANZA,
+                      aleatorios: np.ndarray = None) -> np.ndarray:
+    """
+    Elige la jugada que maximiza la puntuación esperada, en lote.
+
+    La puntuación esperada de cada jugada es el producto de las
+    probabilidades por MATRIZ_PAGOS. Si la confianza (probabilidad máxima)
+    baja de umbral, se juega al azar con una probabilidad que crece
+    linealmente hasta 1 cuando las probabilidades son uniformes, para no
+    ser explotable.
+
+    Args:
+        probas: (n, 3) probabilidades de la próxima jugada del oponente
+        umbral: confianza a partir de la cual no se mezcla (<= 1/3 desactiva
+            la mezcla)
+        aleatorios: (n, 2) uniformes en [0, 1) (mezcla y jugada al azar)
+
+    Returns:
+        Array (n,) con las jugadas de la IA (0=piedra, 1=papel, 2=tijera)
+    """
+    probas = np.atleast_2d(np.asarray(probas, dtype=float))
+    if aleatorios is None:
+        aleatorios = np.random.random((len(probas), 2))
+
+    puntuacion = probas @ MATRIZ_PAGOS.T
+    jugada = puntuacion.argmax(axis=1)
+
+    # La confianza nunca baja de 1/3: con umbral <= 1/3 no se mezcla
+    if umbral <= 1 / 3:
+        return jugada
+
+    confianza = probas.max(axis=1)
+    mezcla = np.clip((umbral - confianza) / (umbral - 1 / 3), 0, 1)
+
+    al_azar = aleatorios[:, 0] < mezcla
+    return np.where(al_azar, (aleatorios[:, 1] * 3).astype(int), jugada)
+
+
+class JugadorIA:
+    """
+    Clase que encapsula el modelo para jugar.
+    """
+
+    def __init__(self, ruta_modelo: str = None, usar_cache: bool = False,
+                 resolucion_cache: int = RESOLUCION_FRECUENCIAS,
+                 capacidad_cache: int = 4096, ruta_tabla: str = None,
+                 ventana: int = None, decaimiento: float = None,
+                 politica: str = "esperada", umbral: float = UMBRAL_CONFIANZA,
+                 semilla: int = None, perfil=None):
+        """
+        Inicializa el jugador IA.
+
+        Si se indica ruta_tabla, solo se carga la tabla destilada (sin
+        pandas, sklearn ni pickle) y cada decisión es una consulta al array.
+
+        ventana/decaimiento configuran el olvido de las frecuencias; si no
+        se indican se usan los guardados en el paquete del modelo.
+
+        politica: "esperada" (ver politica_esperada) o "argmax" (jugar lo
+        que gana a la predicción más probable).
+
+        semilla: semilla del generador aleatorio; si no se indica se crea
+        una nueva y queda en self.semilla para poder reproducir la sesión.
+
+        perfil: Perfil guardado del oponente (ver perfiles.py); se usa
+        para predecir las primeras rondas, antes de tener historial.
+        """
+        if politica not in ("esperada", "argmax"):
+            raise ValueError(f"Política desconocida: {politica}")
+        if not 0 <= umbral <= 1:
+            raise ValueError(f"El umbral debe estar entre 0 y 1: {umbral}")
+
+        self.modelo = None
+        self.tabla = None
+        self.historial = []  # Lista de (jugada_j1, jugada_j2)
+        self.cache = None
+        self.frecuencias = ContadorFrecuencias(ventana, decaimiento)
+        self.politica = politica
+        self.umbral = umbral
+        self.semilla = semilla if semilla is not None else int(np.random.SeedSequence().entropy)
+        self.rng = np.random.default_rng(self.semilla)
+        self.traza = None
+        self._decision = None
+        self.perfil = perfil if perfil is not None and not perfil.vacio else None
+        self.metadatos_tabla = {}
+
+        if ruta_tabla is not None:
+            try:
+                self.tabla = cargar_tabla(ruta_tabla)
+                print("✓ Tabla destilada cargada correctamente")
+            except FileNotFoundError:
+                print("⚠ Tabla no encontrada. La IA jugará aleatoriamente.")
+                return
+            except ValueError as e:
+                print(f"⚠ Tabla no válida ({e}). La IA jugará aleatoriamente.")
+                return
+
+            self.metadatos_tabla = cargar_metadatos_tabla(ruta_tabla)
+            self._configurar_olvido(self.metadatos_tabla.get('estadisticas'), ventana, decaimiento)
+            self._avisar_tabla_desactualizada()
+            return
+
+        from modelo import cargar_modelo, CachePredicciones
+
+        if usar_cache:
+            self.cache = CachePredicciones(capacidad_cache, resolucion_cache)
+
+        # Intentar cargar el modelo
+        try:
+            self.modelo = cargar_modelo(ruta_modelo)
+            print("✓ Modelo cargado correctamente")
+        except FileNotFoundError:
+            print("⚠ Modelo no encontrado. La IA jugará aleatoriamente.")
+        except ValueError as e:
+            # Paquete corrupto (checksum) o de una versión no soportada
+            print(f"⚠ Modelo no válido ({e}). La IA jugará aleatoriamente.")
+
+        self._configurar_olvido(getattr(self.modelo, 'metadatos', {}).get('estadisticas'),
+                                ventana, decaimiento)
+
+    def _configurar_olvido(self, olvido: dict, ventana: int, decaimiento: float):
+        """Usa el olvido con el que se entrenó el modelo si no se ha indicado otro."""
+        if olvido and ventana is None and decaimiento is None:
+            self.frecuencias = ContadorFrecuencias(olvido.get('ventana'), olvido.get('decaimiento'))
+
+    def _avisar_tabla_desactualizada(self):
+        """Avisa si la tabla no se destiló del paquete publicado ahora."""
+        from paquete import huella_publicada
+
+        if not self.metadatos_tabla:
+            print("⚠ La tabla no tiene metadatos: vuelve a destilarla con python src/destilar.py")
+            return
+
+        publicada = huella_publicada()
+        if publicada is not None and publicada != self.metadatos_tabla.get('huella'):
+            print("⚠ La tabla se destiló de otro modelo: vuelve a destilarla con python src/destilar.py")
+
+    @property
+    def huella(self) -> str:
+        """Huella del modelo con el que se juega (el de origen en modo tabla)."""
+        if self.tabla is not None:
+            return self.metadatos_tabla.get('huella')
+        return getattr(self.modelo, 'huella', None)
+
+    def recargar_modelo(self, ruta: str = None):
+        """
+        Sustituye el modelo por la última versión publicada.
+
+        La referencia se cambia de una vez, así que una decisión en curso
+        usa el modelo anterior o el nuevo, nunca una mezcla.
+        """
+        from modelo import cargar_modelo, CachePredicciones
+
+        modelo = cargar_modelo(ruta)
+        if self.cache is not None:
+            self.cache = CachePredicciones(self.cache.capacidad, self.cache.resolucion)
+        self.modelo = modelo
+
+    def clonar(self, semilla: int = None) -> "JugadorIA":
+        """
+        Crea un jugador para una partida nueva que comparte el modelo ya
+        cargado (y la cache/tabla) pero con el historial vacío.
+
+        semilla: semilla del generador del clon (p. ej. derivada de la
+        del torneo); si no se indica se crea una nueva.
+        """
+        nuevo = copy.copy(self)
+        nuevo.historial = []
+        nuevo.frecuencias = self.frecuencias.vacio()
+        nuevo.semilla = semilla if semilla is not None else int(np.random.SeedSequence().entropy)
+        nuevo.rng = np.random.default_rng(nuevo.semilla)
+        nuevo.traza = None
+        nuevo._decision = None
+        return nuevo
+
+    def perfil_sesion(self):
+        """Perfil de la sesión en curso, para fusionarlo con el guardado."""
+        from perfiles import Perfil
+
+        return Perfil.desde_sesion([j1 for j1, _ in self.historial], [j2 for _, j2 in self.historial])
+
+    def _probabilidades_perfil(self) -> np.ndarray:
+        """Probabilidades del perfil mientras no hay historial suficiente."""
+        if self.perfil is None or len(self.historial) >= 3:
+            return None
+        return self.perfil.probabilidades([j1 for j1, _ in self.historial])
+
+    def iniciar_traza(self, ruta: str):
+        """
+        Empieza a grabar la sesión en una traza binaria (ver traza.py).
+        """
+        from traza import EscritorTraza
+
+        self.traza = EscritorTraza(ruta, self.semilla, self.huella,
+                                   self.politica, self.umbral,
+                                   perfil=self.perfil.a_bytes() if self.perfil is not None else b"")
+
+    def cerrar_traza(self):
+        """Vuelca y cierra la traza en curso."""
+        if self.traza is not None:
+            self.traza.cerrar()
+            self.traza = None
+
+    def registrar_ronda(self, jugada_j1: str, jugada_j2: str):
+        """
+        Registra una ronda jugada para actualizar el historial.
+        """
+        if self.traza is not None and self._decision is not None:
+            probas, features = self._decision
+            self.traza.escribir(JUGADA_A_NUM[jugada_j1], JUGADA_A_NUM[jugada_j2], probas, features)
+            self._decision = None
+
+        self.historial.append((jugada_j1, jugada_j2))
+        self.frecuencias.actualizar(JUGADA_A_NUM[jugada_j1])
+
+    def obtener_features_actuales(self) -> np.ndarray:
+        """
+        Genera las features basadas en el historial actual.
+        """
+        if len(self.historial) < 3:
+            # No hay suficiente historial, devolver features por defecto
+            return np.array([0.33, 0.33, 0.33, 0, 0, 0, 0, 0, 0, 0, 0])
+
+        # Extraer solo las últimas jugadas del jugador (j1)
+        jugadas_j1 = [JUGADA_A_NUM[j1] for j1, j2 in self.historial[-3:]]
+
+        # Feature 1-3: Frecuencias (contador incremental, O(1))
+        freq_piedra, freq_papel, freq_tijera = self.frecuencias.frecuencias()
+
+        # Feature 4-6: Lag features (últimas 3 jugadas)
+        lag1 = jugadas_j1[-1] if len(jugadas_j1) >= 1 else 0
+        lag2 = jugadas_j1[-2] if len(jugadas_j1) >= 2 else 0
+        lag3 = jugadas_j1[-3] if len(jugadas_j1) >= 3 else 0
+
+        # Feature 7: Fase del juego (inicio=0, medio=1, final=2)
+        fase = min(2, len(self.historial) // 17)  # Asumiendo 50 rondas
+
+        # Feature 8: Diferencia IA vs Jugador (última ronda)
+        if len(self.historial) > 0:
+            ultima_j1, ultima_j2 = self.historial[-1]
+            diff = JUGADA_A_NUM[ultima_j2] - JUGADA_A_NUM[ultima_j1]
+        else:
+            diff = 0
+
+        # Features opcionales (usar 0 si no disponibles)
+        resultado_anterior = 0
+        racha_victorias = 0
+        racha_derrotas = 0
+
+        features = np.array([
+            freq_piedra,
+            freq_papel,
+            freq_tijera,
+            lag1,
+            lag2,
+            lag3,
+            fase,
+            diff,
+            resultado_anterior,
+            racha_victorias,
+            racha_derrotas
+        ])
+
+        return features
+
+    def predecir_jugada_oponente(self) -> str:
+        """
+        Predice la próxima jugada del oponente.
+        """
+        probas = self._probabilidades_perfil()
+        if probas is not None:
+            return NUM_A_JUGADA[int(np.argmax(probas))]
+
+        if self.tabla is not None:
+            return NUM_A_JUGADA[consultar_tabla(self.tabla, self.obtener_features_actuales())]
+
+        if self.modelo is None:
+            # Si no hay modelo, jugar aleatorio
+            return str(self.rng.choice(["piedra", "papel", "tijera"]))
+
+        try:
+            features = self.obtener_features_actuales()
+            if self.cache is not None:
+                prediccion = self.cache.predecir(self.modelo, features)
+            else:
+                prediccion = self.modelo.predict([features])[0]
+            return NUM_A_JUGADA[int(prediccion)]
+        except Exception as e:
+            print(f"Error en predicción: {e}")
+            return str(self.rng.choice(["piedra", "papel", "tijera"]))
+
+    def predecir_probabilidades(self) -> np.ndarray:
+        """
+        Probabilidad de cada próxima jugada del oponente.
+
+        La tabla y la cache solo guardan la clase, así que en esos modos
+        se devuelve una distribución degenerada (confianza total).
+        """
+        probas = self._probabilidades_perfil()
+        if probas is not None:
+            return probas
+
+        if self.modelo is None and self.tabla is None:
+            return np.full(3, 1 / 3)
+
+        if self.tabla is not None or self.cache is not None:
+            probas = np.zeros(3)
+            probas[JUGADA_A_NUM[self.predecir_jugada_oponente()]] = 1
+            return probas
+
+        try:
+            return probas_completas(self.modelo, [self.obtener_features_actuales()])[0]
+        except Exception as e:
+            print(f"Error en predicción: {e}")
+            return np.full(3, 1 / 3)
+
+    def decidir_jugada(self) -> str:
+        """
+        Decide qué jugada hacer para ganar al oponente.
+        """
+        # La tabla solo guarda la clase: con confianza total la política
+        # esperada juega lo mismo que argmax, así que se evita calcularla
+        solo_tabla = self.tabla is not None and self._probabilidades_perfil() is None
+
+        if self.politica == "argmax" or solo_tabla:
+            prediccion_oponente = self.predecir_jugada_oponente()
+
+            # Jugar lo que le gana a la predicción
+            jugada = PIERDE_CONTRA[prediccion_oponente]
+            probas = np.zeros(3)
+            probas[JUGADA_A_NUM[prediccion_oponente]] = 1
+        else:
+            probas = self.predecir_probabilidades()
+            jugada = NUM_A_JUGADA[int(politica_esperada(probas, self.umbral, self.rng.random((1, 2)))[0])]
+
+        if self.traza is not None:
+            self._decision = (probas, self.obtener_features_actuales())
+
+        return jugada
@@ -8,32 +8,34 @@ para predecir y ganar en Piedra, Papel o Tijera.
 
 import os
 import pickle
+import sys
 import warnings
+from collections import OrderedDict
 from pathlib import Path
 
 import pandas as pd
 import numpy as np
 
-warnings.filterwarnings("ignore", message="X does not have valid feature names")
+# Agregar el directorio src al path para importar los modulos hermanos
+sys.path.insert(0, str(Path(__file__).parent))
+
+from estadisticas import frecuencias_lote
+from jugador import (JugadorIA, politica_esperada, cargar_tabla, forma_tabla, consultar_tabla,
+                     JUGADA_A_NUM, NUM_A_JUGADA, GANA_A, PIERDE_CONTRA, NUM_FEATURES,
+                     RESOLUCION_FRECUENCIAS, MAX_RACHA_TABLA, MATRIZ_PAGOS, UMBRAL_CONFIANZA,
+                     RUTA_TABLA)
 
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, classification_report
-from sklearn.neighbors import KNeighborsClassifier
-from sklearn.tree import DecisionTreeClassifier
-from sklearn.ensemble import RandomForestClassifier
+warnings.filterwarnings("ignore", message="X does not have valid feature names")
 
 # Configuracion de rutas
 RUTA_PROYECTO = Path(__file__).parent.parent
 RUTA_DATOS = RUTA_PROYECTO / "data" / "resultado_partidas.csv"
 RUTA_MODELO = RUTA_PROYECTO / "models" / "modelo_entrenado.pkl"
+RUTA_PAQUETE = RUTA_MODELO.with_suffix("")
 
-# Mapeo de jugadas a numeros
-JUGADA_A_NUM = {"piedra": 0, "papel": 1, "tijera": 2}
-NUM_A_JUGADA = {0: "piedra", 1: "papel", 2: "tijera"}
-
-# Que jugada gana a cual
-GANA_A = {"piedra": "tijera", "papel": "piedra", "tijera": "papel"}
-PIERDE_CONTRA = {"piedra": "papel", "papel": "tijera", "tijera": "piedra"}
+# Olvido de las frecuencias del jugador (None en ambos = acumulado)
+VENTANA_FRECUENCIAS = None
+DECAIMIENTO_FRECUENCIAS = None
 
 
 # =============================================================================
@@ -86,16 +88,21 @@ def preparar_datos(df: pd.DataFrame) -> pd.DataFrame:
 # PARTE 2: FEATURE ENGINEERING
 # =============================================================================
 
-def crear_features(df: pd.DataFrame) -> pd.DataFrame:
+def crear_features(df: pd.DataFrame, ventana: int = None,
+                   decaimiento: float = None) -> pd.DataFrame:
     """
     Crea las features para el modelo.
+
+    Con ventana o decaimiento las frecuencias olvidan las jugadas antiguas
+    (ver estadisticas.py); JugadorIA debe usar la misma configuración.
     """
     df = df.copy()
 
-    # Feature 1: Frecuencias acumuladas del jugador
-    df['freq_piedra_jugador'] = (df['jugador'] == 'piedra').expanding().mean()
-    df['freq_papel_jugador'] = (df['jugador'] == 'papel').expanding().mean()
-    df['freq_tijera_jugador'] = (df['jugador'] == 'tijera').expanding().mean()
+    # Feature 1: Frecuencias del jugador (acumuladas, en ventana o con decaimiento)
+    frecuencias = frecuencias_lote(df['jugador_num'].values, ventana, decaimiento)
+    df['freq_piedra_jugador'] = frecuencias[:, 0]
+    df['freq_papel_jugador'] = frecuencias[:, 1]
+    df['freq_tijera_jugador'] = frecuencias[:, 2]
 
     # Feature 2: Lag features - jugadas anteriores
     df['jugada_anterior_1'] = df['jugador_num'].shift(1)
@@ -126,9 +133,9 @@ def crear_features(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def seleccionar_features(df: pd.DataFrame) -> tuple:
+def columnas_features(df: pd.DataFrame) -> list:
     """
-    Selecciona las features para entrenar y el target.
+    Devuelve las columnas de features disponibles en el DataFrame.
     """
     # Definir columnas de features
     feature_cols = [
@@ -150,6 +157,15 @@ def seleccionar_features(df: pd.DataFrame) -> tuple:
     if 'racha_derrotas' in df.columns:
         feature_cols.append('racha_derrotas')
 
+    return feature_cols
+
+
+def seleccionar_features(df: pd.DataFrame) -> tuple:
+    """
+    Selecciona las features para entrenar y el target.
+    """
+    feature_cols = columnas_features(df)
+
     # Eliminar filas con NaN en las features o en el target
     df_clean = df[feature_cols + ['proxima_jugada_jugador']].dropna()
 
@@ -166,22 +182,31 @@ def seleccionar_features(df: pd.DataFrame) -> tuple:
 # PARTE 3: ENTRENAMIENTO Y FUNCIONAMIENTO
 # =============================================================================
 
-def entrenar_modelo(X, y, test_size: float = 0.2):
+def entrenar_modelo(X, y, test_size: float = 0.2, n_folds: int = 5,
+                    devolver_metricas: bool = False):
     """
     Entrena el modelo de prediccion.
+
+    Los candidatos se evalúan con validación temporal sobre la última
+    fracción test_size (n_folds bloques, ver evaluacion.py) y se elige el
+    de mayor winrate esperado jugando PIERDE_CONTRA[pred]. El elegido se
+    reentrena con todos los datos.
+
+    Con devolver_metricas=True devuelve (modelo, metricas) para guardarlas
+    en los metadatos del paquete.
     """
+    # sklearn se importa aquí para que jugar con la tabla destilada no lo cargue
+    from sklearn.metrics import classification_report
+    from sklearn.neighbors import KNeighborsClassifier
+    from sklearn.tree import DecisionTreeClassifier
+    from sklearn.ensemble import RandomForestClassifier
+
+    from evaluacion import validacion_temporal
+
     print("\n" + "="*50)
     print("   ENTRENAMIENTO DE MODELOS")
     print("="*50)
 
-    # Dividir datos
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=test_size, random_state=42, shuffle=False
-    )
-
-    print(f"\nDatos de entrenamiento: {len(X_train)}")
-    print(f"Datos de prueba: {len(X_test)}")
-
     # Entrenar varios modelos
     modelos = {
         'KNN': KNeighborsClassifier(n_neighbors=5),
@@ -189,166 +214,278 @@ def entrenar_modelo(X, y, test_size: float = 0.2):
         'Random Forest': RandomForestClassifier(n_estimators=50, max_depth=10, random_state=42)
     }
 
-    resultados = {}
+    # Evaluar todos los candidatos en todos los folds
+    evaluacion = validacion_temporal(modelos, X, y, test_size, n_folds)
 
-    for nombre, modelo in modelos.items():
-        print(f"\n--- {nombre} ---")
+    print(f"\nDatos totales: {len(X)}")
+    print(f"Datos de prueba: {len(evaluacion['y'])} en {evaluacion['winrate'].shape[1]} folds")
 
-        # Entrenar
-        modelo.fit(X_train, y_train)
-
-        # Predecir
-        y_pred = modelo.predict(X_test)
-
-        # Evaluar
-        accuracy = accuracy_score(y_test, y_pred)
-        resultados[nombre] = (modelo, accuracy)
+    for c, nombre in enumerate(modelos):
+        print(f"\n--- {nombre} ---")
+        print(f"Winrate esperado: {evaluacion['winrate_total'][c]:.2%}")
+        print(f"Accuracy: {evaluacion['accuracy_total'][c]:.2%}")
+        print(f"Log-loss: {evaluacion['log_loss_total'][c]:.3f}")
+        if 'accuracy_fase' in evaluacion:
+            print("Accuracy por fase: " + " | ".join(
+                f"{fase}: {acc:.2%}" if not np.isnan(acc) else f"{fase}: n/d" for fase, acc in
+                zip(['inicio', 'medio', 'final'], evaluacion['accuracy_fase'][c])))
 
-        print(f"Accuracy: {accuracy:.2%}")
         print("\nReporte de clasificación:")
-        print(classification_report(y_test, y_pred,
+        print(classification_report(evaluacion['y'], evaluacion['probas'][c].argmax(axis=1),
+                                    labels=[0, 1, 2],
                                     target_names=['Piedra', 'Papel', 'Tijera'],
                                     zero_division=0))
 
-    # Seleccionar el mejor modelo
-    mejor_nombre = max(resultados, key=lambda k: resultados[k][1])
-    mejor_modelo, mejor_accuracy = resultados[mejor_nombre]
+    # Seleccionar el mejor modelo por winrate esperado
+    winrates = np.nan_to_num(evaluacion['winrate_total'], nan=-1)
+    mejor = int(np.argmax(winrates))
+    mejor_nombre = list(modelos)[mejor]
+    mejor_modelo = modelos[mejor_nombre].fit(X, y)
 
     print("\n" + "="*50)
     print(f"✓ MEJOR MODELO: {mejor_nombre}")
-    print(f"✓ ACCURACY: {mejor_accuracy:.2%}")
+    print(f"✓ WINRATE ESPERADO: {evaluacion['winrate_total'][mejor]:.2%}")
+    print(f"✓ ACCURACY: {evaluacion['accuracy_total'][mejor]:.2%}")
     print("="*50)
 
+    if devolver_metricas:
+        metricas = {
+            'modelo': mejor_nombre,
+            'winrate': float(evaluacion['winrate_total'][mejor]),
+            'accuracy': float(evaluacion['accuracy_total'][mejor]),
+            'log_loss': float(evaluacion['log_loss_total'][mejor]),
+            'winrate_por_modelo': {k: float(evaluacion['winrate_total'][c])
+                                   for c, k in enumerate(modelos)},
+        }
+        return mejor_modelo, metricas
+
     return mejor_modelo
 
 
-def guardar_modelo(modelo, ruta: str = None):
-    """Guarda el modelo entrenado en un archivo."""
-    if ruta is None:
-        ruta = RUTA_MODELO
+def guardar_modelo(modelo, ruta: str = None, **metadatos):
+    """
+    Guarda el modelo entrenado.
 
-    os.makedirs(os.path.dirname(ruta), exist_ok=True)
-    with open(ruta, "wb") as f:
-        pickle.dump(modelo, f)
+    Por defecto se guarda como paquete versionado (ver paquete.py); los
+    metadatos (features, hash_entrenamiento, metricas, extra) se pasan tal
+    cual. Si la ruta termina en .pkl se usa el formato antiguo.
+    """
+    if ruta is None:
+        ruta = RUTA_PAQUETE
+
+    if str(ruta).endswith(".pkl"):
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        with open(ruta, "wb") as f:
+            pickle.dump(modelo, f)
+    else:
+        from paquete import guardar_paquete
+        guardar_paquete(modelo, ruta, **metadatos)
     print(f"\n✓ Modelo guardado en: {ruta}")
 
 
+def ruta_modelo_por_defecto() -> Path:
+    """Paquete versionado si existe (o se está publicando); si no, el .pkl antiguo."""
+    from paquete import publicacion_en_curso
+
+    if RUTA_PAQUETE.exists() or publicacion_en_curso(RUTA_PAQUETE):
+        return RUTA_PAQUETE
+    return RUTA_MODELO
+
+
 def cargar_modelo(ruta: str = None):
-    """Carga un modelo previamente entrenado."""
+    """
+    Carga un modelo previamente entrenado.
+
+    Acepta un paquete versionado (con checksums), un
+    directorio exportado con modelo_mapeado.py o un .pkl antiguo.
+    """
     if ruta is None:
-        ruta = RUTA_MODELO
+        ruta = ruta_modelo_por_defecto()
+
+    from paquete import es_paquete, cargar_paquete, publicacion_en_curso
+
+    # Un paquete a mitad de publicación falta un instante: cargar_paquete reintenta
+    if publicacion_en_curso(ruta):
+        return cargar_paquete(ruta)
 
     if not os.path.exists(ruta):
         raise FileNotFoundError(f"No se encontró el modelo en: {ruta}")
 
+    if os.path.isdir(ruta):
+        if es_paquete(ruta):
+            return cargar_paquete(ruta)
+
+        from modelo_mapeado import cargar_modelo_mapeado
+        return cargar_modelo_mapeado(ruta)
+
+    warnings.warn(f"Cargando modelo en formato pickle ({ruta}); conviértelo con src/paquete.py")
     with open(ruta, "rb") as f:
         return pickle.load(f)
 
 
 # =============================================================================
-# PARTE 4: PREDICCION Y JUEGO
+# PARTE 4: CACHE DE PREDICCIONES
 # =============================================================================
 
-class JugadorIA:
+def discretizar_lote(X, resolucion: int = RESOLUCION_FRECUENCIAS) -> tuple:
     """
-    Clase que encapsula el modelo para jugar.
+    Convierte una matriz de features en los índices de la tabla densa.
+
+    Acepta matrices de 8 columnas (sin features opcionales), que se
+    completan con ceros.
     """
+    X = np.atleast_2d(np.asarray(X, dtype=float))
+    if X.shape[1] < NUM_FEATURES:
+        X = np.hstack([X, np.zeros((len(X), NUM_FEATURES - X.shape[1]))])
+
+    freqs = np.clip(np.rint(X[:, :2] * resolucion), 0, resolucion).astype(np.intp)
+    discretas = np.rint(X[:, 3:]).astype(np.intp)
+    discretas[:, 4] += 2  # diff: -2..2
+    discretas[:, 5] += 1  # resultado_anterior: -1..1
+    discretas[:, 6:] = np.clip(discretas[:, 6:], 0, MAX_RACHA_TABLA)
 
-    def __init__(self, ruta_modelo: str = None):
-        """Inicializa el jugador IA."""
-        self.modelo = None
-        self.historial = []  # Lista de (jugada_j1, jugada_j2)
-
-        # Intentar cargar el modelo
-        try:
-            self.modelo = cargar_modelo(ruta_modelo)
-            print("✓ Modelo cargado correctamente")
-        except FileNotFoundError:
-            print("⚠ Modelo no encontrado. La IA jugará aleatoriamente.")
-
-    def registrar_ronda(self, jugada_j1: str, jugada_j2: str):
-        """
-        Registra una ronda jugada para actualizar el historial.
-        """
-        self.historial.append((jugada_j1, jugada_j2))
-
-    def obtener_features_actuales(self) -> np.ndarray:
-        """
-        Genera las features basadas en el historial actual.
-        """
-        if len(self.historial) < 3:
-            # No hay suficiente historial, devolver features por defecto
-            return np.array([0.33, 0.33, 0.33, 0, 0, 0, 0, 0, 0, 0, 0])
-
-        # Extraer solo las jugadas del jugador (j1)
-        jugadas_j1 = [JUGADA_A_NUM[j1] for j1, j2 in self.historial]
-
-        # Feature 1-3: Frecuencias
-        total = len(jugadas_j1)
-        freq_piedra = jugadas_j1.count(0) / total
-        freq_papel = jugadas_j1.count(1) / total
-        freq_tijera = jugadas_j1.count(2) / total
-
-        # Feature 4-6: Lag features (últimas 3 jugadas)
-        lag1 = jugadas_j1[-1] if len(jugadas_j1) >= 1 else 0
-        lag2 = jugadas_j1[-2] if len(jugadas_j1) >= 2 else 0
-        lag3 = jugadas_j1[-3] if len(jugadas_j1) >= 3 else 0
-
-        # Feature 7: Fase del juego (inicio=0, medio=1, final=2)
-        fase = min(2, len(self.historial) // 17)  # Asumiendo 50 rondas
-
-        # Feature 8: Diferencia IA vs Jugador (última ronda)
-        if len(self.historial) > 0:
-            ultima_j1, ultima_j2 = self.historial[-1]
-            diff = JUGADA_A_NUM[ultima_j2] - JUGADA_A_NUM[ultima_j1]
-        else:
-            diff = 0
-
-        # Features opcionales (usar 0 si no disponibles)
-        resultado_anterior = 0
-        racha_victorias = 0
-        racha_derrotas = 0
-
-        features = np.array([
-            freq_piedra,
-            freq_papel,
-            freq_tijera,
-            lag1,
-            lag2,
-            lag3,
-            fase,
-            diff,
-            resultado_anterior,
-            racha_victorias,
-            racha_derrotas
-        ])
-
-        return features
-
-    def predecir_jugada_oponente(self) -> str:
-        """
-        Predice la próxima jugada del oponente.
-        """
-        if self.modelo is None:
-            # Si no hay modelo, jugar aleatorio
-            return np.random.choice(["piedra", "papel", "tijera"])
-
-        try:
-            features = self.obtener_features_actuales()
-            prediccion = self.modelo.predict([features])[0]
-            return NUM_A_JUGADA[int(prediccion)]
-        except Exception as e:
-            print(f"Error en predicción: {e}")
-            return np.random.choice(["piedra", "papel", "tijera"])
-
-    def decidir_jugada(self) -> str:
-        """
-        Decide qué jugada hacer para ganar al oponente.
-        """
-        prediccion_oponente = self.predecir_jugada_oponente()
-
-        # Jugar lo que le gana a la predicción
-        return PIERDE_CONTRA[prediccion_oponente]
+    return tuple(freqs.T) + tuple(discretas.T)
+
+
+def discretizar_features(features, resolucion: int = RESOLUCION_FRECUENCIAS) -> tuple:
+    """Clave discreta (índices de la tabla) para un único vector de features."""
+    return tuple(int(i[0]) for i in discretizar_lote(features, resolucion))
+
+
+def features_de_celdas(indices_planos, resolucion: int = RESOLUCION_FRECUENCIAS) -> np.ndarray:
+    """
+    Genera el vector de features representativo de cada celda de la tabla.
+    """
+    idx = np.unravel_index(np.asarray(indices_planos), forma_tabla(resolucion))
+
+    freq_piedra = idx[0] / resolucion
+    freq_papel = idx[1] / resolucion
+    freq_tijera = np.clip(1 - freq_piedra - freq_papel, 0, 1)
+
+    return np.column_stack([
+        freq_piedra, freq_papel, freq_tijera,
+        idx[2], idx[3], idx[4], idx[5],
+        idx[6] - 2, idx[7] - 1,
+        idx[8], idx[9]
+    ]).astype(float)
+
+
+def predecir_celdas(modelo, inicio: int, fin: int,
+                    resolucion: int = RESOLUCION_FRECUENCIAS) -> np.ndarray:
+    """Predice las celdas [inicio, fin) de la tabla aplanada."""
+    X = features_de_celdas(np.arange(inicio, fin), resolucion)
+    return modelo.predict(X[:, :modelo.n_features_in_]).astype(np.int8)
+
+
+def precomputar_tabla(modelo, resolucion: int = RESOLUCION_FRECUENCIAS,
+                      tam_bloque: int = 200_000) -> np.ndarray:
+    """
+    Precalcula la predicción del modelo para todo el espacio discreto.
+
+    Con la tabla en memoria, predecir es una única consulta a un array.
+    """
+    forma = forma_tabla(resolucion)
+    tabla = np.empty(int(np.prod(forma)), dtype=np.int8)
+
+    for inicio in range(0, tabla.size, tam_bloque):
+        fin = min(inicio + tam_bloque, tabla.size)
+        tabla[inicio:fin] = predecir_celdas(modelo, inicio, fin, resolucion)
+
+    return tabla.reshape(forma)
+
+
+class CachePredicciones:
+    """
+    Cache LRU de predicciones indexada por las features discretizadas.
+
+    Las lags, la fase y la diferencia ya son discretas; las frecuencias se
+    cuantizan con la resolución indicada. En un fallo se predice sobre el
+    vector representativo de la celda, de modo que la cache devuelve lo
+    mismo que la tabla precalculada.
+    """
+
+    def __init__(self, capacidad: int = 4096,
+                 resolucion: int = RESOLUCION_FRECUENCIAS):
+        self.capacidad = capacidad
+        self.resolucion = resolucion
+        self.tabla = None
+        self.aciertos = 0
+        self.fallos = 0
+        self._entradas = OrderedDict()
+
+    def precomputar(self, modelo):
+        """Calcula la tabla completa; a partir de aquí no hay fallos."""
+        self.tabla = precomputar_tabla(modelo, self.resolucion)
+        self._entradas.clear()
+
+    def predecir(self, modelo, features) -> int:
+        """Devuelve la predicción para las features, usando la cache."""
+        clave = discretizar_features(features, self.resolucion)
+
+        if self.tabla is not None:
+            self.aciertos += 1
+            return int(self.tabla[clave])
+
+        if clave in self._entradas:
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return self._entradas[clave]
+
+        self.fallos += 1
+        indice = np.ravel_multi_index(clave, forma_tabla(self.resolucion))
+        prediccion = int(predecir_celdas(modelo, indice, indice + 1, self.resolucion)[0])
+
+        self._entradas[clave] = prediccion
+        if len(self._entradas) > self.capacidad:
+            self._entradas.popitem(last=False)
+
+        return prediccion
+
+    @property
+    def tasa_aciertos(self) -> float:
+        consultas = self.aciertos + self.fallos
+        return self.aciertos / consultas if consultas > 0 else 0.0
+
+
+def comparar_precision_cache(modelo, X, y,
+                             resolucion: int = RESOLUCION_FRECUENCIAS,
+                             test_size: float = 0.2, n_folds: int = 5) -> dict:
+    """
+    Compara la accuracy de la predicción exacta con la de la cache.
+
+    Se mide fuera de muestra con los mismos folds temporales que
+    entrenar_modelo: en cada fold se reentrena una copia del modelo con
+    lo anterior y se evalúan el vector exacto y el de su celda.
+    """
+    from sklearn.base import clone
+    from evaluacion import folds_temporales
+
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y)
+
+    exacta, cuantizada = [], []
+    for fin_train, fin_test in folds_temporales(len(X), test_size, n_folds):
+        ajustado = clone(modelo).fit(X[:fin_train], y[:fin_train])
+        X_test = X[fin_train:fin_test]
+        indices = np.ravel_multi_index(discretizar_lote(X_test, resolucion), forma_tabla(resolucion))
+        exacta.append(ajustado.predict(X_test))
+        cuantizada.append(ajustado.predict(features_de_celdas(indices, resolucion)[:, :X.shape[1]]))
+
+    exacta = np.concatenate(exacta)
+    cuantizada = np.concatenate(cuantizada)
+    y = y[len(y) - len(exacta):]
+
+    resultado = {
+        'accuracy_exacta': float(np.mean(exacta == y)),
+        'accuracy_cache': float(np.mean(cuantizada == y)),
+        'coincidencia': float(np.mean(exacta == cuantizada)),
+    }
+    resultado['delta'] = resultado['accuracy_cache'] - resultado['accuracy_exacta']
+
+    print(f"✓ Cache (resolución {resolucion}, fuera de muestra): accuracy {resultado['accuracy_cache']:.2%} "
+          f"vs exacta {resultado['accuracy_exacta']:.2%} "
+          f"(delta {resultado['delta']:+.2%}, coincidencia {resultado['coincidencia']:.2%})")
+    return resultado
 
 
 # =============================================================================
@@ -359,6 +496,13 @@ def main():
     """
     Función principal para entrenar el modelo.
     """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Entrena el modelo de IA")
+    parser.add_argument("--pickle", action="store_true",
+                        help="Guardar tambien el modelo en .pkl (para los benchmarks de carga)")
+    args = parser.parse_args()
+
     print("="*50)
     print("   RPSAI - Entrenamiento del Modelo")
     print("="*50)
@@ -374,7 +518,7 @@ def main():
 
         # 3. Crear features
         print("\n[3/6] Creando features...")
-        df = crear_features(df)
+        df = crear_features(df, VENTANA_FRECUENCIAS, DECAIMIENTO_FRECUENCIAS)
 
         # 4. Seleccionar features
         print("\n[4/6] Seleccionando features...")
@@ -382,11 +526,18 @@ def main():
 
         # 5. Entrenar modelo
         print("\n[5/6] Entrenando modelos...")
-        modelo = entrenar_modelo(X, y)
+        modelo, metricas = entrenar_modelo(X, y, devolver_metricas=True)
 
         # 6. Guardar modelo
         print("\n[6/6] Guardando modelo...")
-        guardar_modelo(modelo)
+        from paquete import hash_datos
+        guardar_modelo(modelo, features=columnas_features(df),
+                       hash_entrenamiento=hash_datos(X, y), metricas=metricas,
+                       extra={'estadisticas': {'ventana': VENTANA_FRECUENCIAS,
+                                               'decaimiento': DECAIMIENTO_FRECUENCIAS}})
+        if args.pickle:
+            guardar_modelo(modelo, RUTA_MODELO)
+        comparar_precision_cache(modelo, X, y)
 
         print("\n" + "="*50)
         print("✓ ENTRENAMIENTO COMPLETADO")
@@ -0,0 +1,347 @@
+"""
+RPSAI - Modelo en Memoria Mapeada
+=================================
+
+Exporta los modelos (Decision Tree, Random Forest y KNN) a arrays de
+NumPy guardados con np.save. Al abrirlos con
+mmap_mode='r', todos los procesos de una maquina comparten una unica
+copia fisica del modelo en lugar de deserializar cada uno la suya.
+
+Uso:
+    python src/modelo_mapeado.py               # exportar el modelo entrenado
+    python src/modelo_mapeado.py --benchmark 4 # medir RSS con 4 procesos
+
+Si el modelo entrenado es un paquete (python src/modelo.py) ya esta
+exportado: el paquete se usa directamente como modelo mapeado. El
+benchmark necesita ademas el .pkl (python src/modelo.py --pickle).
+"""
+
+import os
+import pickle
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+RUTA_MODELO = Path(__file__).parent.parent / "models" / "modelo_entrenado.pkl"
+RUTA_MODELO_MAPEADO = RUTA_MODELO.with_name("modelo_entrenado_arrays")
+
+# Arrays que componen el modelo exportado, segun su tipo
+ARRAYS_ARBOLES = ("izquierda", "derecha", "feature", "umbral", "valor",
+                  "raices", "clases", "info")
+ARRAYS_VECINOS = ("X_entrenamiento", "y_entrenamiento", "clases", "info")
+
+
+# =============================================================================
+# EXPORTACION
+# =============================================================================
+
+def arrays_de_arboles(modelo) -> dict:
+    """
+    Aplana todos los arboles del modelo en arrays contiguos.
+
+    Los indices de los hijos se desplazan para que apunten al array
+    global; las hojas mantienen -1.
+    """
+    arboles = getattr(modelo, "estimators_", None)
+    if arboles is None:
+        if not hasattr(modelo, "tree_"):
+            raise ValueError(f"Solo se pueden exportar modelos de arboles, no {type(modelo).__name__}")
+        arboles = [modelo]
+
+    izquierda, derecha, feature, umbral, valor, raices = [], [], [], [], [], []
+    desplazamiento = 0
+
+    for arbol in arboles:
+        t = arbol.tree_
+        hojas = t.children_left < 0
+
+        izquierda.append(np.where(hojas, -1, t.children_left + desplazamiento))
+        derecha.append(np.where(hojas, -1, t.children_right + desplazamiento))
+        feature.append(np.where(hojas, 0, t.feature))
+        umbral.append(t.threshold)
+
+        # Probabilidad de cada clase en el nodo
+        v = t.value[:, 0, :]
+        valor.append(v / v.sum(axis=1, keepdims=True))
+
+        raices.append(desplazamiento)
+        desplazamiento += t.node_count
+
+    profundidad = max(arbol.tree_.max_depth for arbol in arboles)
+
+    return {
+        "izquierda": np.concatenate(izquierda).astype(np.int32),
+        "derecha": np.concatenate(derecha).astype(np.int32),
+        "feature": np.concatenate(feature).astype(np.int32),
+        "umbral": np.concatenate(umbral).astype(np.float64),
+        "valor": np.concatenate(valor).astype(np.float64),
+        "raices": np.array(raices, dtype=np.int32),
+        "clases": np.asarray(modelo.classes_).astype(np.int64),
+        "info": np.array([modelo.n_features_in_, profundidad], dtype=np.int64),
+    }
+
+
+def arrays_de_vecinos(modelo) -> dict:
+    """Guarda los puntos de entrenamiento de un KNN euclideo uniforme."""
+    if modelo.weights != "uniform" or modelo.effective_metric_ != "euclidean":
+        raise ValueError("Solo se pueden exportar KNN euclideos con pesos uniformes")
+
+    return {
+        "X_entrenamiento": np.asarray(modelo._fit_X, dtype=np.float64),
+        "y_entrenamiento": np.asarray(modelo._y, dtype=np.int64),
+        "clases": np.asarray(modelo.classes_).astype(np.int64),
+        "info": np.array([modelo.n_features_in_, modelo.n_neighbors], dtype=np.int64),
+    }
+
+
+def arrays_de_modelo(modelo) -> dict:
+    """Arrays del modelo segun su tipo (arboles o vecinos)."""
+    if hasattr(modelo, "n_neighbors"):
+        return arrays_de_vecinos(modelo)
+    return arrays_de_arboles(modelo)
+
+
+def exportar_modelo_mapeado(modelo, ruta_dir: str = None) -> list:
+    """
+    Guarda el modelo como un directorio de ficheros .npy.
+
+    Returns:
+        Lista de nombres de los arrays guardados
+    """
+    if ruta_dir is None:
+        ruta_dir = RUTA_MODELO_MAPEADO
+
+    os.makedirs(ruta_dir, exist_ok=True)
+    arrays = arrays_de_modelo(modelo)
+    for nombre, array in arrays.items():
+        np.save(os.path.join(ruta_dir, f"{nombre}.npy"), array)
+
+    print(f"✓ Modelo mapeado guardado en: {ruta_dir}")
+    return list(arrays)
+
+
+# =============================================================================
+# CARGA Y PREDICCION
+# =============================================================================
+
+class BosqueMapeado:
+    """
+    Predictor de arboles que trabaja sobre arrays (posiblemente mapeados).
+
+    Ofrece predict/predict_proba igual que el modelo de sklearn, pero sin
+    importar sklearn y sin copiar los arrays a memoria privada.
+    """
+
+    def __init__(self, arrays: dict):
+        self.izquierda = arrays["izquierda"]
+        self.derecha = arrays["derecha"]
+        self.feature = arrays["feature"]
+        self.umbral = arrays["umbral"]
+        self.valor = arrays["valor"]
+        self.raices = arrays["raices"]
+        self.classes_ = np.asarray(arrays["clases"])
+        self.n_features_in_ = int(arrays["info"][0])
+        self.profundidad = int(arrays["info"][1])
+
+    def predict_proba(self, X) -> np.ndarray:
+        # sklearn compara las features en float32
+        X = np.atleast_2d(np.asarray(X, dtype=np.float32))
+        filas = np.arange(len(X))
+
+        # Se recorren todos los arboles a la vez, un nivel por iteracion
+        nodo = np.repeat(self.raices[:, None], len(X), axis=1)
+        for _ in range(self.profundidad):
+            izq = self.izquierda[nodo]
+            hoja = izq < 0
+            if hoja.all():
+                break
+            va_izq = X[filas, self.feature[nodo]] <= self.umbral[nodo]
+            nodo = np.where(hoja, nodo, np.where(va_izq, izq, self.derecha[nodo]))
+
+        return self.valor[nodo].mean(axis=0)
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+class VecinosMapeados:
+    """
+    KNN por fuerza bruta sobre los puntos de entrenamiento guardados.
+
+    Equivale al KNeighborsClassifier euclideo con pesos uniformes, salvo
+    en el desempate entre vecinos exactamente equidistantes.
+    """
+
+    def __init__(self, arrays: dict, tam_bloque: int = 4096):
+        self.X_entrenamiento = arrays["X_entrenamiento"]
+        self.y_entrenamiento = arrays["y_entrenamiento"]
+        self.classes_ = np.asarray(arrays["clases"])
+        self.n_features_in_ = int(arrays["info"][0])
+        self.n_neighbors = int(arrays["info"][1])
+        self.tam_bloque = tam_bloque
+
+    def predict_proba(self, X) -> np.ndarray:
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        k = self.n_neighbors
+        probas = np.empty((len(X), len(self.classes_)))
+
+        for inicio in range(0, len(X), self.tam_bloque):
+            bloque = X[inicio:inicio + self.tam_bloque]
+            distancias = ((bloque[:, None, :] - self.X_entrenamiento[None]) ** 2).sum(axis=2)
+            vecinos = np.argpartition(distancias, k - 1, axis=1)[:, :k]
+            etiquetas = self.y_entrenamiento[vecinos]
+            probas[inicio:inicio + len(bloque)] = np.stack(
+                [(etiquetas == c).mean(axis=1) for c in range(len(self.classes_))], axis=1)
+
+        return probas
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def cargar_arrays(ruta_dir: str, mmap: bool = True) -> dict:
+    """Abre los arrays de un modelo exportado, detectando su tipo."""
+    es_arbol = os.path.exists(os.path.join(ruta_dir, "izquierda.npy"))
+    nombres = ARRAYS_ARBOLES if es_arbol else ARRAYS_VECINOS
+
+    modo = "r" if mmap else None
+    return {nombre: np.load(os.path.join(ruta_dir, f"{nombre}.npy"), mmap_mode=modo)
+            for nombre in nombres}
+
+
+def modelo_de_arrays(arrays: dict):
+    """Construye el predictor adecuado para los arrays dados."""
+    if "izquierda" in arrays:
+        return BosqueMapeado(arrays)
+    return VecinosMapeados(arrays)
+
+
+def cargar_modelo_mapeado(ruta_dir: str = None, mmap: bool = True):
+    """Abre un modelo exportado; con mmap=True los arrays se comparten."""
+    if ruta_dir is None:
+        ruta_dir = RUTA_MODELO_MAPEADO
+
+    if not os.path.isdir(ruta_dir):
+        raise FileNotFoundError(f"No se encontró el modelo mapeado en: {ruta_dir}")
+
+    return modelo_de_arrays(cargar_arrays(ruta_dir, mmap))
+
+
+# =============================================================================
+# MEDICION DE MEMORIA
+# =============================================================================
+
+def medir_memoria() -> dict:
+    """
+    Memoria del proceso actual en KB.
+
+    PSS reparte las paginas compartidas entre los procesos que las usan,
+    asi que es la medida que refleja el ahorro del mapeo.
+    """
+    memoria = {}
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for linea in f:
+                campo, _, resto = linea.partition(":")
+                if campo in ("Rss", "Pss"):
+                    memoria[campo.lower()] = int(resto.split()[0])
+    except OSError:
+        import resource
+        memoria["rss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return memoria
+
+
+def _trabajador_benchmark(args: tuple) -> dict:
+    """Carga el modelo en un proceso nuevo y mide tiempo y memoria."""
+    formato, ruta, n_muestras = args
+    antes = medir_memoria()
+
+    t0 = time.perf_counter()
+    if formato == "pickle":
+        with open(ruta, "rb") as f:
+            modelo = pickle.load(f)
+    else:
+        modelo = cargar_modelo_mapeado(ruta)
+    tiempo_carga = time.perf_counter() - t0
+
+    # Predecir para tocar todas las paginas del modelo
+    X = np.random.default_rng(0).random((n_muestras, modelo.n_features_in_))
+    modelo.predict(X)
+
+    despues = medir_memoria()
+    return {
+        "carga_ms": tiempo_carga * 1000,
+        **{f"{k}_kb": despues[k] - antes.get(k, 0) for k in despues},
+    }
+
+
+def benchmark(procesos: int = 4, ruta_pickle: str = None, ruta_mapeado: str = None,
+              n_muestras: int = 1000):
+    """Compara la carga con pickle y con mapeo en N procesos a la vez."""
+    from multiprocessing import get_context
+
+    if ruta_pickle is None:
+        ruta_pickle = RUTA_MODELO
+    if ruta_mapeado is None:
+        ruta_mapeado = RUTA_MODELO_MAPEADO
+
+    print(f"\nBenchmark con {procesos} procesos (incremento de memoria por proceso)")
+    print("-" * 60)
+
+    contexto = get_context("spawn")
+    for formato, ruta in (("pickle", ruta_pickle), ("mmap", ruta_mapeado)):
+        with contexto.Pool(procesos) as pool:
+            medidas = pool.map(_trabajador_benchmark, [(formato, str(ruta), n_muestras)] * procesos)
+
+        resumen = {k: np.mean([m[k] for m in medidas]) for k in medidas[0]}
+        print(f"{formato:>7}: " + " | ".join(f"{k}={v:.1f}" for k, v in resumen.items()))
+
+
+def main():
+    """Funcion principal."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Exporta el modelo a arrays mapeables en memoria")
+    parser.add_argument("--modelo", default=None,
+                        help="Modelo de origen: paquete o .pkl (default: el entrenado)")
+    parser.add_argument("--salida", default=str(RUTA_MODELO_MAPEADO), help="Directorio de salida")
+    parser.add_argument("--benchmark", type=int, default=0, metavar="N",
+                        help="Medir carga y RSS con N procesos tras exportar")
+    args = parser.parse_args()
+
+    from modelo import cargar_modelo, ruta_modelo_por_defecto
+    from paquete import es_paquete
+
+    ruta_modelo = args.modelo or str(ruta_modelo_por_defecto())
+    try:
+        modelo = cargar_modelo(ruta_modelo)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"\n❌ Error: {e}")
+        print("\nEntrena tu modelo primero con: python src/modelo.py")
+        sys.exit(1)
+
+    ruta_mapeado = args.salida
+    if es_paquete(ruta_modelo):
+        # El paquete ya guarda los arrays mapeables
+        ruta_mapeado = ruta_modelo
+        print(f"✓ El paquete ya contiene el modelo mapeado: {ruta_modelo}")
+    else:
+        try:
+            exportar_modelo_mapeado(modelo, args.salida)
+        except ValueError as e:
+            print(f"\n❌ Error: {e}")
+            sys.exit(1)
+
+    if args.benchmark > 0:
+        ruta_pickle = ruta_modelo if ruta_modelo.endswith(".pkl") else str(RUTA_MODELO)
+        if not os.path.exists(ruta_pickle):
+            print(f"\n❌ Error: No se encontró el modelo pickle en: {ruta_pickle}")
+            print("\nGuarda tambien el .pkl para comparar con: python src/modelo.py --pickle")
+            sys.exit(1)
+        benchmark(args.benchmark, ruta_pickle, ruta_mapeado)
+
+
+if __name__ == "__main__":
+    main()
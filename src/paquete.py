@@ -0,0 +1,296 @@
+"""
+RPSAI - Paquete de Modelo Versionado
+====================================
+
+Formato seguro para guardar el modelo sin pickle: un directorio con
+metadata.json (version del formato, features, hash de los datos de
+entrenamiento, version de sklearn, metricas y checksums) y los arrays
+del modelo en ficheros .npy.
+
+Uso:
+    python src/paquete.py --convertir models/modelo_entrenado.pkl
+    python src/paquete.py --benchmark
+
+El paquete:
+1. Verifica el SHA-256 de cada array antes de usarlo
+2. Abre los arrays en memoria mapeada (compartidos entre procesos) al
+   cargarlo, asi que sigue funcionando aunque despues se publique otro
+   paquete en la misma ruta
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from datetime import datetime
+from importlib.metadata import version, PackageNotFoundError
+from pathlib import Path
+
+import numpy as np
+
+# Agregar el directorio src al path para importar modelo_mapeado
+sys.path.insert(0, str(Path(__file__).parent))
+
+from modelo_mapeado import exportar_modelo_mapeado, cargar_arrays, modelo_de_arrays
+
+RUTA_PAQUETE = Path(__file__).parent.parent / "models" / "modelo_entrenado"
+FICHERO_METADATOS = "metadata.json"
+VERSION_FORMATO = 1
+
+# Reintentos al abrir un paquete que se está publicando en ese momento
+REINTENTOS_CARGA = 5
+ESPERA_REINTENTO = 0.05
+
+
+# =============================================================================
+# HASHES
+# =============================================================================
+
+def hash_fichero(ruta: str) -> str:
+    """SHA-256 de un fichero, leido por bloques."""
+    h = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def hash_datos(X, y) -> str:
+    """SHA-256 de los datos de entrenamiento (features y target)."""
+    h = hashlib.sha256()
+    for array in (X, y):
+        array = np.ascontiguousarray(array)
+        h.update(str(array.shape).encode())
+        h.update(array.tobytes())
+    return h.hexdigest()
+
+
+# =============================================================================
+# GUARDADO
+# =============================================================================
+
+def guardar_paquete(modelo, ruta: str = None, features: list = None,
+                    hash_entrenamiento: str = None, metricas: dict = None,
+                    extra: dict = None):
+    """
+    Guarda el modelo como paquete versionado.
+
+    Se escribe en un directorio temporal y se sustituye el anterior al
+    final, de modo que un lector nunca ve un paquete a medio escribir.
+    Entre los dos os.replace la ruta no existe un instante; cargar_paquete
+    lo cubre reintentando.
+    """
+    if ruta is None:
+        ruta = RUTA_PAQUETE
+    ruta = Path(ruta)
+
+    temporal = ruta.with_name(ruta.name + ".tmp")
+    shutil.rmtree(temporal, ignore_errors=True)
+
+    nombres = exportar_modelo_mapeado(modelo, temporal)
+
+    try:
+        version_sklearn = version("scikit-learn")
+    except PackageNotFoundError:
+        version_sklearn = None
+
+    metadatos = {
+        "version_formato": VERSION_FORMATO,
+        "tipo": type(modelo).__name__,
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "features": features,
+        "n_features": int(modelo.n_features_in_),
+        "hash_datos": hash_entrenamiento,
+        "version_sklearn": version_sklearn,
+        "metricas": metricas or {},
+        "archivos": {nombre: hash_fichero(temporal / f"{nombre}.npy") for nombre in nombres},
+    }
+    if extra:
+        metadatos.update(extra)
+
+    with open(temporal / FICHERO_METADATOS, "w", encoding="utf-8") as f:
+        json.dump(metadatos, f, indent=2, ensure_ascii=False)
+
+    antiguo = ruta.with_name(ruta.name + ".old")
+    if ruta.exists():
+        os.replace(ruta, antiguo)
+    os.replace(temporal, ruta)
+    shutil.rmtree(antiguo, ignore_errors=True)
+
+    print(f"✓ Paquete guardado en: {ruta}")
+
+
+# =============================================================================
+# CARGA
+# =============================================================================
+
+class PaqueteModelo:
+    """
+    Modelo guardado como paquete.
+
+    Al construirlo se lee metadata.json y se verifican y abren los
+    arrays: los mapeos se mantienen validos aunque guardar_paquete
+    sustituya despues el directorio.
+    """
+
+    def __init__(self, ruta: str = None, verificar: bool = True):
+        if ruta is None:
+            ruta = RUTA_PAQUETE
+        self.ruta = Path(ruta)
+        self.verificar = verificar
+
+        ruta_metadatos = self.ruta / FICHERO_METADATOS
+        if not ruta_metadatos.exists():
+            raise FileNotFoundError(f"No se encontró el paquete en: {self.ruta}")
+
+        with open(ruta_metadatos, encoding="utf-8") as f:
+            self.metadatos = json.load(f)
+
+        if self.metadatos.get("version_formato") != VERSION_FORMATO:
+            raise ValueError(f"Versión de paquete no soportada: {self.metadatos.get('version_formato')}")
+
+        self.n_features_in_ = self.metadatos["n_features"]
+
+        if verificar:
+            for nombre, esperado in self.metadatos["archivos"].items():
+                if hash_fichero(self.ruta / f"{nombre}.npy") != esperado:
+                    raise ValueError(f"Checksum incorrecto en {nombre}.npy: paquete corrupto o modificado")
+        self.modelo = modelo_de_arrays(cargar_arrays(self.ruta))
+
+    @property
+    def huella(self) -> str:
+        """Identificador del contenido del paquete (hash de sus checksums)."""
+        return huella_de_metadatos(self.metadatos)
+
+    @property
+    def classes_(self) -> np.ndarray:
+        return self.modelo.classes_
+
+    def predict(self, X) -> np.ndarray:
+        return self.modelo.predict(X)
+
+    def predict_proba(self, X) -> np.ndarray:
+        return self.modelo.predict_proba(X)
+
+
+def huella_de_metadatos(metadatos: dict) -> str:
+    """Huella de un paquete a partir de su metadata.json."""
+    archivos = json.dumps(metadatos["archivos"], sort_keys=True)
+    return hashlib.sha256(archivos.encode()).hexdigest()
+
+
+def huella_publicada(ruta: str = None) -> str:
+    """Huella del paquete publicado en la ruta (solo lee metadata.json), o None."""
+    if ruta is None:
+        ruta = RUTA_PAQUETE
+    try:
+        with open(Path(ruta) / FICHERO_METADATOS, encoding="utf-8") as f:
+            return huella_de_metadatos(json.load(f))
+    except (FileNotFoundError, KeyError, ValueError):
+        return None
+
+
+def publicacion_en_curso(ruta: str = None) -> bool:
+    """Indica si guardar_paquete está sustituyendo el paquete de la ruta."""
+    if ruta is None:
+        ruta = RUTA_PAQUETE
+    ruta = Path(ruta)
+    return any(ruta.with_name(ruta.name + sufijo).exists() for sufijo in (".tmp", ".old"))
+
+
+def cargar_paquete(ruta: str = None, verificar: bool = True) -> PaqueteModelo:
+    """
+    Abre un paquete de modelo.
+
+    Si se está publicando otro a la vez, el paquete puede faltar un
+    instante o mezclar metadatos de uno y arrays de otro (checksum
+    incorrecto): en ese caso se reintenta antes de dar el error.
+    """
+    for intento in range(REINTENTOS_CARGA):
+        try:
+            return PaqueteModelo(ruta, verificar)
+        except FileNotFoundError:
+            if intento == REINTENTOS_CARGA - 1 or not publicacion_en_curso(ruta):
+                raise
+        except ValueError:
+            if intento == REINTENTOS_CARGA - 1:
+                raise
+        time.sleep(ESPERA_REINTENTO)
+
+
+def es_paquete(ruta: str) -> bool:
+    """Indica si la ruta es un directorio de paquete."""
+    return os.path.isfile(os.path.join(ruta, FICHERO_METADATOS))
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def benchmark(ruta_pickle: str, ruta_paquete: str = None, repeticiones: int = 20):
+    """Compara el tiempo de carga (y primera predicción) con pickle y con paquete."""
+    import pickle
+
+    if ruta_paquete is None:
+        ruta_paquete = RUTA_PAQUETE
+
+    def medir(cargar) -> float:
+        tiempos = []
+        for _ in range(repeticiones):
+            t0 = time.perf_counter()
+            modelo = cargar()
+            modelo.predict(np.zeros((1, modelo.n_features_in_)))
+            tiempos.append(time.perf_counter() - t0)
+        return np.median(tiempos) * 1000
+
+    def cargar_pickle():
+        with open(ruta_pickle, "rb") as f:
+            return pickle.load(f)
+
+    # La primera carga de pickle importa sklearn; no se cuenta
+    cargar_pickle()
+
+    print(f"\nCarga + primera predicción (mediana de {repeticiones})")
+    print("-" * 50)
+    print(f"pickle:                  {medir(cargar_pickle):8.2f} ms")
+    print(f"paquete (con checksum):  {medir(lambda: cargar_paquete(ruta_paquete)):8.2f} ms")
+    print(f"paquete (sin checksum):  {medir(lambda: cargar_paquete(ruta_paquete, False)):8.2f} ms")
+
+
+def main():
+    """Funcion principal."""
+    import argparse
+    import pickle
+
+    parser = argparse.ArgumentParser(description="Gestiona el paquete versionado del modelo")
+    parser.add_argument("--convertir", metavar="PKL", help="Convertir un modelo .pkl antiguo a paquete")
+    parser.add_argument("--benchmark", nargs="?", const=str(RUTA_PAQUETE.with_suffix(".pkl")),
+                        metavar="PKL", help="Comparar la carga del paquete con la del .pkl")
+    parser.add_argument("--paquete", default=str(RUTA_PAQUETE), help="Directorio del paquete")
+    args = parser.parse_args()
+
+    if args.convertir:
+        with open(args.convertir, "rb") as f:
+            modelo = pickle.load(f)
+        guardar_paquete(modelo, args.paquete, extra={"origen": os.path.basename(args.convertir)})
+
+    if args.benchmark:
+        if not os.path.exists(args.benchmark):
+            print(f"\n❌ Error: No se encontró el modelo pickle en: {args.benchmark}")
+            print("\nGuarda tambien el .pkl para comparar con: python src/modelo.py --pickle")
+            sys.exit(1)
+        if not es_paquete(args.paquete):
+            print(f"\n❌ Error: No se encontró el paquete en: {args.paquete}")
+            print("\nEntrena tu modelo primero con: python src/modelo.py")
+            sys.exit(1)
+        benchmark(args.benchmark, args.paquete)
+
+    if not (args.convertir or args.benchmark):
+        paquete = cargar_paquete(args.paquete)
+        print(json.dumps(paquete.metadatos, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+RPSAI - Perfiles de Jugador
+===========================
+
+Guarda entre sesiones lo aprendido de cada jugador (cuentas de Markov de
+2do orden, frecuencias de jugadas y estadisticas de acierto) para que la
+IA no empiece cada partida desde cero.
+
+Los perfiles se guardan en un almacen clave-valor en disco
+(data/perfiles.sqlite): una fila por jugador con un registro binario de
+tamaño fijo (DTYPE_PERFIL). Leer un perfil es una busqueda por clave
+primaria mas un np.frombuffer, muy por debajo de un milisegundo.
+
+Uso:
+    with AlmacenPerfiles() as almacen:
+        perfil = almacen.cargar("ana")          # al empezar la sesion
+        ...
+        almacen.fusionar("ana", perfil_sesion)  # al terminar
+"""
+
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+
+RUTA_PERFILES = Path(__file__).parent.parent / "data" / "perfiles.sqlite"
+
+JUGADAS = ["piedra", "papel", "tijera"]
+A_NUM = {jugada: i for i, jugada in enumerate(JUGADAS)}
+
+VERSION_PERFIL = 1
+DTYPE_PERFIL = np.dtype([
+    ("version", "<u1"),
+    ("transiciones", "<f4", (3, 3, 3)),  # (jugada n-2, jugada n-1) -> jugada n
+    ("conteo", "<f4", 3),                 # veces que ha jugado cada opcion
+    ("sesiones", "<u4"),
+    ("rondas", "<u4"),
+    ("aciertos", "<u4"),                  # rondas en las que la IA predijo bien
+    ("victorias_ia", "<u4"),
+    ("derrotas_ia", "<u4"),
+])
+
+
+class Perfil:
+    """
+    Perfil de un jugador: un registro DTYPE_PERFIL con utilidades para
+    construirlo a partir de una sesion, fusionarlo y usarlo como prior.
+    """
+
+    def __init__(self, datos: np.ndarray = None):
+        if datos is None:
+            datos = np.zeros((), dtype=DTYPE_PERFIL)
+            datos["version"] = VERSION_PERFIL
+        self.datos = datos
+
+    @classmethod
+    def desde_bytes(cls, crudo: bytes) -> "Perfil":
+        datos = np.frombuffer(crudo, dtype=DTYPE_PERFIL, count=1).reshape(()).copy()
+        if datos["version"] != VERSION_PERFIL:
+            raise ValueError(f"Versión de perfil no soportada: {datos['version']}")
+        return cls(datos)
+
+    def a_bytes(self) -> bytes:
+        return self.datos.tobytes()
+
+    @classmethod
+    def desde_sesion(cls, jugadas_jugador: list, jugadas_ia: list,
+                     aciertos: int = None) -> "Perfil":
+        """
+        Perfil de una sola sesion.
+
+        Si no se indican los aciertos de prediccion se usan las victorias
+        de la IA (jugando lo que gana a la prediccion, acertar es ganar).
+        """
+        perfil = cls()
+        d = perfil.datos
+        jugador = [A_NUM[j] for j in jugadas_jugador]
+        ia = [A_NUM[j] for j in jugadas_ia]
+
+        for a, b, c in zip(jugador, jugador[1:], jugador[2:]):
+            d["transiciones"][a, b, c] += 1
+        for j in jugador:
+            d["conteo"][j] += 1
+
+        diferencias = [(i - j) % 3 for i, j in zip(ia, jugador)]
+        d["sesiones"] = 1
+        d["rondas"] = len(jugador)
+        d["victorias_ia"] = diferencias.count(1)
+        d["derrotas_ia"] = diferencias.count(2)
+        d["aciertos"] = d["victorias_ia"] if aciertos is None else aciertos
+        return perfil
+
+    def fusionar(self, otro: "Perfil", olvido: float = 0.0) -> "Perfil":
+        """
+        Suma otro perfil a este. Con olvido > 0 las cuentas antiguas
+        pierden esa fraccion de su peso antes de sumar.
+        """
+        d = self.datos
+        for campo in ("transiciones", "conteo"):
+            d[campo] = d[campo] * (1 - olvido) + otro.datos[campo]
+        for campo in ("sesiones", "rondas", "aciertos", "victorias_ia", "derrotas_ia"):
+            d[campo] += otro.datos[campo]
+        return self
+
+    @property
+    def vacio(self) -> bool:
+        return int(self.datos["rondas"]) == 0
+
+    @property
+    def tasa_aciertos(self) -> float:
+        rondas = int(self.datos["rondas"])
+        return int(self.datos["aciertos"]) / rondas if rondas else 0.0
+
+    def prior_frecuencias(self) -> dict:
+        """Cuentas de cada jugada, con los nombres de las jugadas."""
+        return {jugada: float(c) for jugada, c in zip(JUGADAS, self.datos["conteo"]) if c > 0}
+
+    def matriz_transicion(self) -> dict:
+        """Cuentas de Markov en el formato de transition_matrix de jugar_partida."""
+        matriz = {}
+        for a, b in zip(*np.nonzero(self.datos["transiciones"].sum(axis=2))):
+            fila = self.datos["transiciones"][a, b]
+            matriz[(JUGADAS[a], JUGADAS[b])] = {j: float(c) for j, c in zip(JUGADAS, fila)}
+        return matriz
+
+    def probabilidades(self, ultimas: list = None) -> np.ndarray:
+        """
+        Distribucion de la proxima jugada: la fila de Markov de las dos
+        ultimas jugadas si se ha visto, y si no las frecuencias.
+        """
+        if ultimas is not None and len(ultimas) >= 2:
+            fila = self.datos["transiciones"][A_NUM[ultimas[-2]], A_NUM[ultimas[-1]]]
+            if fila.sum() > 0:
+                return fila / fila.sum()
+
+        conteo = self.datos["conteo"]
+        return conteo / conteo.sum() if conteo.sum() > 0 else np.full(3, 1 / 3)
+
+
+class AlmacenPerfiles:
+    """
+    Almacen clave-valor de perfiles sobre SQLite (portable, un solo fichero,
+    busqueda por clave primaria).
+    """
+
+    def __init__(self, ruta: str = None):
+        if ruta is None:
+            ruta = RUTA_PERFILES
+        Path(ruta).parent.mkdir(parents=True, exist_ok=True)
+
+        self._conexion = sqlite3.connect(str(ruta))
+        self._conexion.execute(
+            "CREATE TABLE IF NOT EXISTS perfiles (jugador TEXT PRIMARY KEY, datos BLOB NOT NULL)"
+            " WITHOUT ROWID")
+
+    def cargar(self, jugador: str) -> Perfil:
+        """Perfil guardado del jugador (vacio si no existe)."""
+        fila = self._conexion.execute(
+            "SELECT datos FROM perfiles WHERE jugador = ?", (jugador,)).fetchone()
+        return Perfil.desde_bytes(fila[0]) if fila else Perfil()
+
+    def guardar(self, jugador: str, perfil: Perfil):
+        with self._conexion:
+            self._escribir(jugador, perfil)
+
+    def _escribir(self, jugador: str, perfil: Perfil):
+        self._conexion.execute(
+            "INSERT OR REPLACE INTO perfiles (jugador, datos) VALUES (?, ?)",
+            (jugador, perfil.a_bytes()))
+
+    def fusionar(self, jugador: str, perfil_sesion: Perfil, olvido: float = 0.0) -> Perfil:
+        """
+        Suma el perfil de una sesion al guardado y lo persiste.
+
+        La lectura y la escritura van en una sola transaccion (BEGIN
+        IMMEDIATE): si dos sesiones del mismo jugador terminan a la vez,
+        la segunda espera a la primera en lugar de pisarla.
+        """
+        with self._conexion:
+            self._conexion.execute("BEGIN IMMEDIATE")
+            perfil = self.cargar(jugador).fusionar(perfil_sesion, olvido)
+            self._escribir(jugador, perfil)
+        return perfil
+
+    def jugadores(self) -> list:
+        return [f[0] for f in self._conexion.execute("SELECT jugador FROM perfiles ORDER BY jugador")]
+
+    def cerrar(self):
+        self._conexion.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.cerrar()
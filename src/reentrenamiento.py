@@ -0,0 +1,295 @@
+"""
+RPSAI - Reentrenamiento en Segundo Plano
+========================================
+
+Vigila el registro de partidas (data/registro_partidas.csv) y, cuando
+terminan nuevas sesiones de jugar_partida o evaluar, entrena un modelo
+candidato, lo compara con el modelo actual en un backtest y solo lo
+publica si gana.
+
+Uso:
+    python src/reentrenamiento.py
+
+O desde un servidor de juego:
+    reentrenador = Reentrenador(al_publicar=ia.recargar_modelo)
+    reentrenador.start()
+
+El reentrenamiento:
+1. Lee solo las filas nuevas del registro (por desplazamiento en bytes)
+2. Calcula las features de las sesiones nuevas; las de las antiguas se
+   reutilizan de la cache del proceso de entrenamiento
+3. Entrena el candidato sin las ultimas sesiones y compara su winrate
+   con el del modelo actual sobre ellas (ninguno de los dos las ha visto)
+4. Si el candidato gana, lo reentrena con todos los datos y lo publica
+
+El entrenamiento corre en un proceso aparte: el hilo vigilante solo
+espera, asi que no compite por el GIL con los hilos que deciden jugadas.
+"""
+
+import os
+import sys
+import threading
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Agregar el directorio src al path para importar modelo
+sys.path.insert(0, str(Path(__file__).parent))
+
+from modelo import (preparar_datos, crear_features, seleccionar_features, columnas_features,
+                    entrenar_modelo, guardar_modelo, cargar_modelo, NUM_FEATURES,
+                    VENTANA_FRECUENCIAS, DECAIMIENTO_FRECUENCIAS, RUTA_DATOS, RUTA_PAQUETE)
+from registro import leer_nuevas, RUTA_REGISTRO
+from evaluacion import winrate
+
+# Muestras minimas para entrenar (KNN necesita al menos 5 vecinos)
+MIN_MUESTRAS = 20
+
+COLUMNAS_NUMERICAS = ['numero_ronda', 'racha_victorias_jugador', 'racha_derrotas_jugador']
+
+
+# =============================================================================
+# PROCESO DE ENTRENAMIENTO
+# =============================================================================
+
+# Cache de features del proceso de entrenamiento: sesion -> (X, y)
+_cache_features = OrderedDict()
+_features = None
+
+
+def _iniciar_trabajador():
+    """Silencia la salida del proceso de entrenamiento."""
+    sys.stdout = open(os.devnull, "w")
+    warnings.filterwarnings("ignore")
+
+
+def features_de_sesion(filas: list) -> tuple:
+    """Calcula (X, y) de una sesion a partir de sus filas del registro."""
+    global _features
+
+    df = pd.DataFrame(filas)
+    for col in COLUMNAS_NUMERICAS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col])
+    df = df.sort_values('numero_ronda')
+
+    df = preparar_datos(df)
+    if len(df) == 0:
+        return np.empty((0, NUM_FEATURES)), np.empty(0, dtype=int)
+
+    df = crear_features(df, VENTANA_FRECUENCIAS, DECAIMIENTO_FRECUENCIAS)
+    if _features is None:
+        _features = columnas_features(df)
+    return seleccionar_features(df)
+
+
+def _apilar(sesiones: list) -> tuple:
+    """Concatena las features cacheadas de las sesiones indicadas."""
+    if not sesiones:
+        return np.empty((0, NUM_FEATURES)), np.empty(0, dtype=int)
+    X = np.vstack([_cache_features[s][0] for s in sesiones])
+    y = np.concatenate([_cache_features[s][1] for s in sesiones])
+    return X, y
+
+
+def ciclo_reentrenamiento(nuevas: dict, base: dict = None, sesiones_validacion: int = 1,
+                          ruta_paquete: str = None) -> dict:
+    """
+    Incorpora sesiones nuevas, entrena y valida un candidato y lo publica
+    si mejora al modelo actual. Se ejecuta en el proceso de entrenamiento.
+
+    Args:
+        nuevas: sesion -> filas del registro, sesiones aun no vistas
+        base: sesiones que solo se usan para entrenar (p. ej. el CSV inicial)
+        sesiones_validacion: cuantas de las sesiones nuevas se reservan
+        ruta_paquete: paquete del modelo publicado
+    """
+    if ruta_paquete is None:
+        ruta_paquete = RUTA_PAQUETE
+
+    for sesiones in (base or {}, nuevas):
+        for sesion, filas in sesiones.items():
+            X, y = features_de_sesion(filas)
+            if len(X) > 0 and X.shape[1] == NUM_FEATURES:
+                _cache_features[sesion] = (X, y)
+
+    validacion = [s for s in nuevas if s in _cache_features][-sesiones_validacion:]
+    entrenamiento = [s for s in _cache_features if s not in validacion]
+    X_train, y_train = _apilar(entrenamiento)
+    X_val, y_val = _apilar(validacion)
+
+    resultado = {'sesiones': len(_cache_features), 'publicado': False}
+    if len(X_train) < MIN_MUESTRAS or len(X_val) == 0:
+        resultado['motivo'] = f"pocos datos ({len(X_train)} muestras de entrenamiento)"
+        return resultado
+
+    candidato = entrenar_modelo(X_train, y_train)
+    resultado['winrate_candidato'] = winrate(candidato, X_val, y_val)
+
+    try:
+        resultado['winrate_actual'] = winrate(cargar_modelo(ruta_paquete), X_val, y_val)
+    except FileNotFoundError:
+        resultado['winrate_actual'] = None
+
+    # Sin rondas decisivas el winrate es NaN y la comparación no decide nada
+    if (resultado['winrate_actual'] is not None
+            and (np.isnan(resultado['winrate_candidato']) or np.isnan(resultado['winrate_actual']))):
+        resultado['motivo'] = "la validación no tiene rondas decisivas"
+        return resultado
+
+    if (resultado['winrate_actual'] is not None
+            and resultado['winrate_candidato'] <= resultado['winrate_actual']):
+        resultado['motivo'] = "el candidato no mejora al modelo actual"
+        return resultado
+
+    # El candidato gana: se reentrena con todos los datos y se publica
+    from paquete import hash_datos
+
+    X, y = _apilar(list(_cache_features))
+    modelo, metricas = entrenar_modelo(X, y, devolver_metricas=True)
+    metricas['backtest'] = {k: resultado[k] for k in ('winrate_candidato', 'winrate_actual')}
+    guardar_modelo(modelo, ruta_paquete, features=_features,
+                   hash_entrenamiento=hash_datos(X, y), metricas=metricas,
+                   extra={'estadisticas': {'ventana': VENTANA_FRECUENCIAS,
+                                           'decaimiento': DECAIMIENTO_FRECUENCIAS},
+                          'sesiones': len(_cache_features)})
+
+    resultado['publicado'] = True
+    return resultado
+
+
+# =============================================================================
+# HILO VIGILANTE
+# =============================================================================
+
+class Reentrenador(threading.Thread):
+    """
+    Hilo que vigila el registro y lanza los ciclos de reentrenamiento.
+
+    Args:
+        ruta_registro: Registro de partidas a vigilar
+        ruta_paquete: Paquete del modelo que se publica
+        intervalo: Segundos entre revisiones del registro
+        min_rondas: Rondas nuevas necesarias para lanzar un ciclo
+        sesiones_validacion: Sesiones nuevas reservadas para el backtest
+        incluir_base: Usar tambien data/resultado_partidas.csv para entrenar
+        al_publicar: Funcion llamada con la ruta del paquete al publicar
+        verbose: Mostrar el resultado de cada ciclo
+    """
+
+    def __init__(self, ruta_registro: str = None, ruta_paquete: str = None,
+                 intervalo: float = 10.0, min_rondas: int = 20,
+                 sesiones_validacion: int = 1, incluir_base: bool = True,
+                 al_publicar=None, verbose: bool = False):
+        super().__init__(name="reentrenador", daemon=True)
+        self.ruta_registro = ruta_registro or RUTA_REGISTRO
+        self.ruta_paquete = ruta_paquete or RUTA_PAQUETE
+        self.intervalo = intervalo
+        self.min_rondas = min_rondas
+        self.sesiones_validacion = sesiones_validacion
+        self.incluir_base = incluir_base
+        self.al_publicar = al_publicar
+        self.verbose = verbose
+
+        self.ciclos = []  # Resultados de cada ciclo
+        self._desplazamiento = 0
+        self._pendientes = OrderedDict()
+        self._procesadas = OrderedDict()  # Sesiones ya enviadas al proceso de entrenamiento
+        self._trabajador_nuevo = True     # Su cache de features está vacía
+        self._parar = threading.Event()
+        self._pool = None
+
+    def _sesiones_base(self) -> dict:
+        if not self.incluir_base or not os.path.exists(RUTA_DATOS):
+            return {}
+        return {'base': pd.read_csv(RUTA_DATOS).to_dict('records')}
+
+    def revisar(self) -> dict:
+        """Lee el registro y, si hay suficientes rondas nuevas, lanza un ciclo."""
+        filas, self._desplazamiento = leer_nuevas(self._desplazamiento, self.ruta_registro)
+        for fila in filas:
+            self._pendientes.setdefault(fila['sesion'], []).append(fila)
+
+        if sum(len(f) for f in self._pendientes.values()) < self.min_rondas:
+            return None
+
+        # Un proceso de entrenamiento nuevo (el primero o uno que sustituye
+        # a otro que murió) recibe todas las sesiones ya leídas
+        base = {**self._sesiones_base(), **self._procesadas} if self._trabajador_nuevo else None
+
+        # El hilo solo espera al proceso de entrenamiento (sin retener el GIL).
+        # Las sesiones pendientes solo se descartan si el ciclo termina: si
+        # falla, se reintentan en la siguiente revisión (el desplazamiento
+        # del registro ya ha pasado de ellas).
+        resultado = self._pool.submit(ciclo_reentrenamiento, self._pendientes, base,
+                                      self.sesiones_validacion, str(self.ruta_paquete)).result()
+        self._procesadas.update(self._pendientes)
+        self._pendientes = OrderedDict()
+        self._trabajador_nuevo = False
+        self.ciclos.append(resultado)
+
+        if self.verbose:
+            print(f"[reentrenamiento] {resultado}")
+        if resultado['publicado'] and self.al_publicar is not None:
+            self.al_publicar(str(self.ruta_paquete))
+        return resultado
+
+    def _nuevo_pool(self) -> ProcessPoolExecutor:
+        self._trabajador_nuevo = True
+        return ProcessPoolExecutor(max_workers=1, initializer=_iniciar_trabajador)
+
+    def run(self):
+        self._pool = self._nuevo_pool()
+        try:
+            while not self._parar.is_set():
+                try:
+                    self.revisar()
+                except BrokenProcessPool:
+                    # El proceso de entrenamiento murió: se crea otro y en el
+                    # siguiente ciclo recibe de nuevo todas las sesiones
+                    print("[reentrenamiento] El proceso de entrenamiento terminó; se reinicia")
+                    self._pool.shutdown(wait=False)
+                    self._pool = self._nuevo_pool()
+                except Exception as e:
+                    print(f"[reentrenamiento] Error: {e}")
+                self._parar.wait(self.intervalo)
+        finally:
+            self._pool.shutdown()
+
+    def detener(self):
+        """Pide al hilo que termine y espera a que lo haga."""
+        self._parar.set()
+        self.join()
+
+
+def main():
+    """Funcion principal."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Reentrena el modelo a partir del registro de partidas")
+    parser.add_argument("-i", "--intervalo", type=float, default=10.0,
+                        help="Segundos entre revisiones del registro (default: 10)")
+    parser.add_argument("-m", "--min-rondas", type=int, default=20,
+                        help="Rondas nuevas necesarias para reentrenar (default: 20)")
+    parser.add_argument("-v", "--validacion", type=int, default=1,
+                        help="Sesiones nuevas reservadas para el backtest (default: 1)")
+    args = parser.parse_args()
+
+    print("Vigilando el registro de partidas (Ctrl+C para salir)...")
+    reentrenador = Reentrenador(intervalo=args.intervalo, min_rondas=args.min_rondas,
+                                sesiones_validacion=args.validacion, verbose=True)
+    reentrenador.start()
+    try:
+        while reentrenador.is_alive():
+            reentrenador.join(1)
+    except KeyboardInterrupt:
+        reentrenador.detener()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+RPSAI - Registro de Partidas
+============================
+
+Registro de solo-añadir con todas las sesiones jugadas (jugar_partida y
+evaluar). Cada sesion se escribe de una vez al terminar, asi que quien
+lee el fichero por el final (el reentrenamiento en segundo plano) nunca
+ve una sesion a medias.
+"""
+
+import csv
+import io
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+RUTA_REGISTRO = Path(__file__).parent.parent / "data" / "registro_partidas.csv"
+
+COLUMNAS_REGISTRO = [
+    'sesion',
+    'origen',
+    'numero_ronda',
+    'jugador',
+    'IA',
+    'resultado',
+    'racha_victorias_jugador',
+    'racha_derrotas_jugador',
+]
+
+# Que jugada gana a cual
+GANA_A = {"piedra": "tijera", "papel": "piedra", "tijera": "papel"}
+
+
+def filas_de_sesion(jugadas_jugador: list, jugadas_ia: list) -> list:
+    """
+    Construye las filas del registro a partir de las jugadas de una sesion.
+
+    El resultado y las rachas se calculan desde el punto de vista del
+    jugador, igual que en jugar_partida.
+    """
+    filas = []
+    racha_victorias = 0
+    racha_derrotas = 0
+
+    for ronda, (jugador, ia) in enumerate(zip(jugadas_jugador, jugadas_ia), 1):
+        if jugador == ia:
+            resultado = 'Empate'
+            racha_victorias = racha_derrotas = 0
+        elif GANA_A[jugador] == ia:
+            resultado = 'Victoria'
+            racha_victorias += 1
+            racha_derrotas = 0
+        else:
+            resultado = 'Derrota'
+            racha_derrotas += 1
+            racha_victorias = 0
+
+        filas.append({
+            'numero_ronda': ronda,
+            'jugador': jugador,
+            'IA': ia,
+            'resultado': resultado,
+            'racha_victorias_jugador': racha_victorias,
+            'racha_derrotas_jugador': racha_derrotas,
+        })
+
+    return filas
+
+
+def nueva_sesion() -> str:
+    """Identificador unico de sesion (fecha y hora + uuid)."""
+    return f"{datetime.now():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}"
+
+
+def anexar_sesion(filas: list, origen: str, ruta: str = None, sesion: str = None) -> str:
+    """
+    Añade una sesion completa al registro.
+
+    Args:
+        sesion: Identificador ya asignado (p. ej. el de su traza); si no
+            se indica se genera uno
+
+    Returns:
+        Identificador de la sesion
+    """
+    if ruta is None:
+        ruta = RUTA_REGISTRO
+    if not filas:
+        return None
+
+    if sesion is None:
+        sesion = nueva_sesion()
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=COLUMNAS_REGISTRO, extrasaction='ignore')
+    if not os.path.exists(ruta) or os.path.getsize(ruta) == 0:
+        writer.writeheader()
+    for fila in filas:
+        writer.writerow({**fila, 'sesion': sesion, 'origen': origen})
+
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    with open(ruta, mode='a', newline='', encoding='utf-8') as f:
+        f.write(buffer.getvalue())
+
+    return sesion
+
+
+def leer_nuevas(desplazamiento: int = 0, ruta: str = None) -> tuple:
+    """
+    Lee las filas añadidas al registro desde el byte indicado.
+
+    Solo se consumen lineas completas.
+
+    Returns:
+        (filas, nuevo_desplazamiento)
+    """
+    if ruta is None:
+        ruta = RUTA_REGISTRO
+    if not os.path.exists(ruta):
+        return [], desplazamiento
+
+    with open(ruta, 'rb') as f:
+        f.seek(desplazamiento)
+        datos = f.read()
+
+    completo = datos[:datos.rfind(b'\n') + 1]
+    lineas = [l for l in completo.decode('utf-8').splitlines()
+              if l and not l.startswith('sesion,')]
+    filas = list(csv.DictReader(lineas, fieldnames=COLUMNAS_REGISTRO))
+
+    return filas, desplazamiento + len(completo)
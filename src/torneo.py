@@ -0,0 +1,384 @@
+"""
+RPSAI - Torneo de Estrategias
+=============================
+
+Enfrenta todas las estrategias entre si (liga a una vuelta) en muchas
+partidas por enfrentamiento y muestra la clasificacion por winrate con
+su intervalo de confianza. Es la forma estandar de decidir que modelo
+se publica.
+
+Uso:
+    python src/torneo.py
+    python src/torneo.py -n 2000 -r 50 --plugin mis_bots:BotEspejo
+
+El torneo:
+1. Simula los bots de politica fija en lote con NumPy (miles de
+   partidas en paralelo, una ronda de todas a la vez)
+2. Reparte las partidas de los jugadores aprendidos (JugadorIA) entre
+   un pool de procesos
+3. Muestra la tabla de la liga (winrate e intervalo de confianza al 95%)
+
+Las jugadas se representan como enteros (0=piedra, 1=papel, 2=tijera).
+"""
+
+import contextlib
+import importlib
+import io
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import combinations
+from pathlib import Path
+
+import numpy as np
+
+# Agregar el directorio src al path para importar modelo
+sys.path.insert(0, str(Path(__file__).parent))
+
+
+# =============================================================================
+# ESTRATEGIAS
+# =============================================================================
+
+class Estrategia:
+    """
+    Estrategia que juega n partidas simultaneas.
+
+    Cada ronda se llama a jugar() para obtener las n jugadas y despues a
+    observar() con las jugadas propias y las del rival. Las estrategias
+    vectorizadas se simulan en un unico lote; el resto se reparte entre
+    procesos.
+    """
+
+    vectorizada = True
+
+    def iniciar(self, n_partidas: int, rng: np.random.Generator):
+        self.n = n_partidas
+        self.rng = rng
+
+    def jugar(self) -> np.ndarray:
+        raise NotImplementedError
+
+    def observar(self, propias: np.ndarray, rivales: np.ndarray):
+        pass
+
+
+class EstrategiaAleatoria(Estrategia):
+    """Juega al azar (winrate esperado del 50% sobre rondas decisivas)."""
+
+    def jugar(self) -> np.ndarray:
+        return self.rng.integers(0, 3, self.n)
+
+
+class EstrategiaConstante(Estrategia):
+    """Juega siempre la misma jugada."""
+
+    def __init__(self, jugada: int = 0):
+        self.jugada = jugada
+
+    def jugar(self) -> np.ndarray:
+        return np.full(self.n, self.jugada)
+
+
+class EstrategiaCiclo(Estrategia):
+    """Recorre piedra, papel, tijera en orden desde una posicion al azar."""
+
+    def iniciar(self, n_partidas: int, rng: np.random.Generator):
+        super().iniciar(n_partidas, rng)
+        self.posicion = rng.integers(0, 3, n_partidas)
+
+    def jugar(self) -> np.ndarray:
+        jugadas = self.posicion.copy()
+        self.posicion = (self.posicion + 1) % 3
+        return jugadas
+
+
+class EstrategiaFrecuencia(Estrategia):
+    """Gana a la jugada mas frecuente del rival hasta el momento."""
+
+    def iniciar(self, n_partidas: int, rng: np.random.Generator):
+        super().iniciar(n_partidas, rng)
+        self.conteo = np.zeros((n_partidas, 3))
+
+    def jugar(self) -> np.ndarray:
+        if not self.conteo.any():
+            return self.rng.integers(0, 3, self.n)
+        return (self.conteo.argmax(axis=1) + 1) % 3
+
+    def observar(self, propias: np.ndarray, rivales: np.ndarray):
+        self.conteo[np.arange(self.n), rivales] += 1
+
+
+class EstrategiaMarkov(Estrategia):
+    """
+    Version vectorizada de obtener_eleccion_ia (RockPaperScissors.py).
+
+    Markov de 2do orden con el mismo arranque: aleatorio en las 3 primeras
+    rondas, la jugada mas comun en la 4a y, si la secuencia no se ha visto,
+    la jugada mas comun del historial. Los empates se resuelven por orden
+    piedra, papel, tijera.
+
+    Con decaimiento > 0 las transiciones olvidan como en jugar_partida.
+    """
+
+    def __init__(self, decaimiento: float = 0.0):
+        self.decaimiento = decaimiento
+
+    def iniciar(self, n_partidas: int, rng: np.random.Generator):
+        super().iniciar(n_partidas, rng)
+        self.filas = np.arange(n_partidas)
+        self.transiciones = np.zeros((n_partidas, 3, 3, 3))
+        self.conteo = np.zeros((n_partidas, 3))
+        self.ultimas = np.zeros((n_partidas, 2), dtype=np.intp)
+        self.vistas = 0
+
+    def jugar(self) -> np.ndarray:
+        if self.vistas < 3:
+            return self.rng.integers(0, 3, self.n)
+
+        prediccion = self.conteo.argmax(axis=1)
+        if self.vistas >= 4:
+            fila = self.transiciones[self.filas, self.ultimas[:, 0], self.ultimas[:, 1]]
+            vista = fila.sum(axis=1) > 0
+            prediccion = np.where(vista, fila.argmax(axis=1), prediccion)
+
+        return (prediccion + 1) % 3
+
+    def observar(self, propias: np.ndarray, rivales: np.ndarray):
+        if self.decaimiento > 0:
+            self.transiciones *= 1 - self.decaimiento
+        if self.vistas >= 2:
+            self.transiciones[self.filas, self.ultimas[:, 0], self.ultimas[:, 1], rivales] += 1
+        self.ultimas[:, 0] = self.ultimas[:, 1]
+        self.ultimas[:, 1] = rivales
+        self.conteo[self.filas, rivales] += 1
+        self.vistas += 1
+
+
+class EstrategiaJugadorIA(Estrategia):
+    """
+    Adaptador de JugadorIA: una instancia por partida sobre un unico
+    modelo cargado.
+    """
+
+    vectorizada = False
+
+    def __init__(self, **kwargs_jugador):
+        self.kwargs_jugador = kwargs_jugador
+
+    def iniciar(self, n_partidas: int, rng: np.random.Generator):
+        from jugador import JugadorIA, JUGADA_A_NUM, NUM_A_JUGADA
+
+        super().iniciar(n_partidas, rng)
+        self.a_num = JUGADA_A_NUM
+        self.a_jugada = NUM_A_JUGADA
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            base = JugadorIA(**self.kwargs_jugador)
+        self.jugadores = [base.clonar(int(semilla)) for semilla in rng.integers(0, 2**63, n_partidas)]
+
+    def jugar(self) -> np.ndarray:
+        return np.array([self.a_num[j.decidir_jugada()] for j in self.jugadores])
+
+    def observar(self, propias: np.ndarray, rivales: np.ndarray):
+        for jugador, propia, rival in zip(self.jugadores, propias, rivales):
+            jugador.registrar_ronda(self.a_jugada[int(rival)], self.a_jugada[int(propia)])
+
+
+# Estrategias disponibles: nombre -> fabrica sin argumentos
+ESTRATEGIAS = {
+    "ia": EstrategiaJugadorIA,
+    "markov": EstrategiaMarkov,
+    "markov_decaido": partial(EstrategiaMarkov, 0.1),
+    "frecuencia": EstrategiaFrecuencia,
+    "aleatoria": EstrategiaAleatoria,
+    "ciclo": EstrategiaCiclo,
+    "siempre_piedra": partial(EstrategiaConstante, 0),
+}
+
+
+def registrar_estrategia(nombre: str, fabrica):
+    """Añade una estrategia al torneo (fabrica sin argumentos)."""
+    ESTRATEGIAS[nombre] = fabrica
+
+
+def cargar_plugin(especificacion: str) -> tuple:
+    """
+    Carga una estrategia externa con el formato 'modulo:atributo'.
+
+    El atributo debe ser una subclase de Estrategia (o una fabrica sin
+    argumentos) definida a nivel de modulo para poder usarla en el pool.
+    """
+    nombre_modulo, _, atributo = especificacion.partition(":")
+    if not atributo:
+        raise ValueError(f"Plugin no valido (usa modulo:atributo): {especificacion}")
+
+    fabrica = getattr(importlib.import_module(nombre_modulo), atributo)
+    registrar_estrategia(atributo, fabrica)
+    return atributo, fabrica
+
+
+# =============================================================================
+# SIMULACION
+# =============================================================================
+
+def simular_lote(fabrica_a, fabrica_b, n_partidas: int, n_rondas: int, semilla: int) -> np.ndarray:
+    """
+    Simula n_partidas entre A y B, todas a la vez.
+
+    Returns:
+        Array (n_partidas, 3) con victorias, derrotas y empates de A
+    """
+    rng = np.random.default_rng(semilla)
+
+    a, b = fabrica_a(), fabrica_b()
+    a.iniciar(n_partidas, rng)
+    b.iniciar(n_partidas, rng)
+
+    victorias = np.zeros(n_partidas, dtype=np.int64)
+    derrotas = np.zeros(n_partidas, dtype=np.int64)
+
+    for _ in range(n_rondas):
+        jugadas_a = np.asarray(a.jugar())
+        jugadas_b = np.asarray(b.jugar())
+
+        # (a - b) % 3 == 1 -> gana A; == 2 -> gana B
+        diferencia = (jugadas_a - jugadas_b) % 3
+        victorias += diferencia == 1
+        derrotas += diferencia == 2
+
+        a.observar(jugadas_a, jugadas_b)
+        b.observar(jugadas_b, jugadas_a)
+
+    return np.column_stack([victorias, derrotas, n_rondas - victorias - derrotas])
+
+
+def jugar_enfrentamiento(fabrica_a, fabrica_b, n_partidas: int, n_rondas: int,
+                         semilla: int = 0, pool: ProcessPoolExecutor = None,
+                         procesos: int = 1) -> np.ndarray:
+    """
+    Juega un enfrentamiento completo.
+
+    Si alguna estrategia no es vectorizada y hay pool, las partidas se
+    reparten en bloques entre los procesos.
+    """
+    vectorizado = fabrica_a.vectorizada if hasattr(fabrica_a, "vectorizada") else True
+    vectorizado &= fabrica_b.vectorizada if hasattr(fabrica_b, "vectorizada") else True
+
+    if vectorizado or pool is None:
+        return simular_lote(fabrica_a, fabrica_b, n_partidas, n_rondas, semilla)
+
+    tamanos = [len(b) for b in np.array_split(np.arange(n_partidas), procesos) if len(b)]
+    futuros = [pool.submit(simular_lote, fabrica_a, fabrica_b, tam, n_rondas, semilla + i)
+               for i, tam in enumerate(tamanos)]
+    return np.vstack([f.result() for f in futuros])
+
+
+def winrate_con_intervalo(resultados: np.ndarray) -> tuple:
+    """
+    Winrate medio por partida (victorias / decisivas) e IC al 95%.
+
+    La unidad independiente es la partida, no la ronda.
+    """
+    decisivas = resultados[:, 0] + resultados[:, 1]
+    winrates = resultados[decisivas > 0, 0] / decisivas[decisivas > 0] * 100
+    if len(winrates) == 0:
+        return float("nan"), float("nan")
+
+    media = winrates.mean()
+    margen = 1.96 * winrates.std(ddof=1) / np.sqrt(len(winrates)) if len(winrates) > 1 else float("nan")
+    return media, margen
+
+
+def jugar_torneo(nombres: list = None, n_partidas: int = 1000, n_rondas: int = 50,
+                 procesos: int = None, semilla: int = 0) -> list:
+    """
+    Liga a una vuelta entre las estrategias indicadas.
+
+    Returns:
+        Clasificacion: lista de dicts ordenada por winrate
+    """
+    if nombres is None:
+        nombres = list(ESTRATEGIAS)
+    if procesos is None:
+        procesos = os.cpu_count() or 1
+
+    resultados = {nombre: [] for nombre in nombres}
+    enfrentamientos = {}
+
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        for i, (a, b) in enumerate(combinations(nombres, 2)):
+            r = jugar_enfrentamiento(ESTRATEGIAS[a], ESTRATEGIAS[b], n_partidas, n_rondas,
+                                     semilla + 1000 * i, pool, procesos)
+            resultados[a].append(r)
+            resultados[b].append(r[:, [1, 0, 2]])  # desde el punto de vista de B
+            enfrentamientos[(a, b)] = winrate_con_intervalo(r)[0]
+            enfrentamientos[(b, a)] = 100 - enfrentamientos[(a, b)]
+
+    clasificacion = []
+    for nombre in nombres:
+        total = np.vstack(resultados[nombre])
+        winrate, margen = winrate_con_intervalo(total)
+        v, d, e = total.sum(axis=0)
+        clasificacion.append({"estrategia": nombre, "victorias": int(v), "derrotas": int(d),
+                              "empates": int(e), "winrate": winrate, "margen": margen,
+                              "enfrentamientos": {r: enfrentamientos[(nombre, r)]
+                                                  for r in nombres if r != nombre}})
+
+    clasificacion.sort(key=lambda fila: fila["winrate"], reverse=True)
+    return clasificacion
+
+
+def mostrar_clasificacion(clasificacion: list):
+    """Muestra la tabla de la liga y el winrate de cada enfrentamiento."""
+    print("\n" + "="*72)
+    print("   CLASIFICACION")
+    print("="*72)
+    print(f"{'Pos':>3}  {'Estrategia':<16}{'V':>9}{'D':>9}{'E':>9}  {'Winrate':>8}  {'IC 95%':>8}")
+    for pos, fila in enumerate(clasificacion, 1):
+        print(f"{pos:>3}  {fila['estrategia']:<16}{fila['victorias']:>9}{fila['derrotas']:>9}"
+              f"{fila['empates']:>9}  {fila['winrate']:>7.2f}%  ±{fila['margen']:>6.2f}")
+
+    nombres = [fila["estrategia"] for fila in clasificacion]
+    print("\nWinrate de la fila contra la columna:")
+    print(" " * 16 + "".join(f"{n[:10]:>11}" for n in nombres))
+    for fila in clasificacion:
+        celdas = "".join(f"{'-':>11}" if r == fila["estrategia"]
+                         else f"{'n/d':>11}" if np.isnan(fila["enfrentamientos"][r])
+                         else f"{fila['enfrentamientos'][r]:>10.1f}%" for r in nombres)
+        print(f"{fila['estrategia']:<16}{celdas}")
+
+
+def main():
+    """Funcion principal."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Torneo entre estrategias de piedra, papel o tijera")
+    parser.add_argument("-n", "--partidas", type=int, default=1000,
+                        help="Partidas por enfrentamiento (default: 1000)")
+    parser.add_argument("-r", "--rondas", type=int, default=50,
+                        help="Rondas por partida (default: 50)")
+    parser.add_argument("-p", "--procesos", type=int, default=None,
+                        help="Procesos para los jugadores aprendidos (default: todos los nucleos)")
+    parser.add_argument("-e", "--estrategias", default=None,
+                        help=f"Lista separada por comas (default: {','.join(ESTRATEGIAS)})")
+    parser.add_argument("--plugin", action="append", default=[], metavar="MODULO:ATRIBUTO",
+                        help="Añadir una estrategia externa (se puede repetir)")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla del torneo")
+    args = parser.parse_args()
+
+    for especificacion in args.plugin:
+        cargar_plugin(especificacion)
+
+    nombres = args.estrategias.split(",") if args.estrategias else None
+    desconocidas = [n for n in nombres or [] if n not in ESTRATEGIAS]
+    if desconocidas:
+        parser.error(f"Estrategias desconocidas: {', '.join(desconocidas)}")
+
+    clasificacion = jugar_torneo(nombres, args.partidas, args.rondas, args.procesos, args.semilla)
+    mostrar_clasificacion(clasificacion)
+
+
+if __name__ == "__main__":
+    main()
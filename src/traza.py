@@ -0,0 +1,188 @@
+"""
+RPSAI - Trazas de Decisiones
+============================
+
+Graba cada sesion de JugadorIA en un fichero binario compacto (jugadas,
+features, probabilidades, huella del modelo y semilla del generador) y
+permite reproducirla contra cualquier modelo para comparar decisiones.
+
+Uso:
+    python src/traza.py data/trazas/<sesion>.rpst
+    python src/traza.py data/trazas/<sesion>.rpst --modelo models/otro_paquete
+
+Formato:
+    Cabecera (ver FORMATO_CABECERA), el perfil del jugador si se usó
+    (registro de perfiles.DTYPE_PERFIL, su longitud va en la cabecera) y
+    un registro de tamaño fijo por ronda (ver DTYPE_RONDA), todo en
+    little-endian.
+"""
+
+import contextlib
+import io
+import struct
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Agregar el directorio src al path para importar modelo
+sys.path.insert(0, str(Path(__file__).parent))
+
+RUTA_TRAZAS = Path(__file__).parent.parent / "data" / "trazas"
+
+MAGIA = b"RPST"
+VERSION_TRAZA = 3
+
+# magia, version, n_features, politica, umbral, semilla (128 bits), huella (sha256),
+# longitud del perfil
+FORMATO_CABECERA = "<4sBBBd16s32sH"
+TAM_CABECERA = struct.calcsize(FORMATO_CABECERA)
+POLITICAS = ("argmax", "esperada")
+
+N_FEATURES_TRAZA = 11
+DTYPE_RONDA = np.dtype([
+    ("ronda", "<u2"),
+    ("humano", "i1"),
+    ("ia", "i1"),
+    ("probas", "<f4", 3),
+    ("features", "<f4", N_FEATURES_TRAZA),
+])
+
+
+class EscritorTraza:
+    """
+    Escribe la traza de una sesion: una ronda es un registro de tamaño
+    fijo. Se vuelca al disco cada volcar_cada rondas, de modo que una
+    sesion interrumpida conserva todas las rondas volcadas.
+    """
+
+    def __init__(self, ruta: str, semilla: int, huella: str = None,
+                 politica: str = "esperada", umbral: float = 0.0,
+                 tam_buffer: int = 1 << 16, volcar_cada: int = 1,
+                 perfil: bytes = b""):
+        Path(ruta).parent.mkdir(parents=True, exist_ok=True)
+        self.ruta = ruta
+        self.volcar_cada = volcar_cada
+        # "x": nunca se sobrescribe la traza de otra sesion
+        self._fichero = open(ruta, "xb", buffering=tam_buffer)
+        self._registro = np.zeros(1, dtype=DTYPE_RONDA)
+        self._ronda = 0
+
+        self._fichero.write(struct.pack(
+            FORMATO_CABECERA, MAGIA, VERSION_TRAZA, N_FEATURES_TRAZA,
+            POLITICAS.index(politica), umbral,
+            semilla.to_bytes(16, "little"),
+            bytes.fromhex(huella) if huella else bytes(32), len(perfil)))
+        self._fichero.write(perfil)
+
+    def escribir(self, humano: int, ia: int, probas, features):
+        """Añade el registro de una ronda."""
+        self._ronda += 1
+        r = self._registro[0]
+        r["ronda"] = self._ronda
+        r["humano"] = humano
+        r["ia"] = ia
+        r["probas"] = probas
+        r["features"] = features
+        self._fichero.write(self._registro.tobytes())
+        if self._ronda % self.volcar_cada == 0:
+            self._fichero.flush()
+
+    def cerrar(self):
+        self._fichero.close()
+
+
+def leer_traza(ruta: str) -> tuple:
+    """
+    Lee una traza completa.
+
+    Returns:
+        (cabecera, rondas): dict con la cabecera y array DTYPE_RONDA
+    """
+    with open(ruta, "rb") as f:
+        datos = f.read()
+
+    magia, version, n_features, politica, umbral, semilla, huella, tam_perfil = \
+        struct.unpack_from(FORMATO_CABECERA, datos)
+    if magia != MAGIA:
+        raise ValueError(f"No es un fichero de traza: {ruta}")
+    if version != VERSION_TRAZA or n_features != N_FEATURES_TRAZA:
+        raise ValueError(f"Versión de traza no soportada: {version}")
+
+    cabecera = {
+        "politica": POLITICAS[politica],
+        "umbral": umbral,
+        "semilla": int.from_bytes(semilla, "little"),
+        "huella": huella.hex() if any(huella) else None,
+        "perfil": datos[TAM_CABECERA:TAM_CABECERA + tam_perfil] or None,
+    }
+
+    # Solo registros completos (una sesion cortada a mitad sigue siendo legible)
+    cuerpo = datos[TAM_CABECERA + tam_perfil:]
+    n = len(cuerpo) // DTYPE_RONDA.itemsize
+    rondas = np.frombuffer(cuerpo, dtype=DTYPE_RONDA, count=n)
+    return cabecera, rondas
+
+
+def reproducir_traza(ruta: str, ruta_modelo: str = None, ruta_tabla: str = None) -> dict:
+    """
+    Reproduce una traza contra un modelo y compara las decisiones.
+
+    El jugador se crea con la semilla, la política y el perfil grabados
+    y se le registran las jugadas originales, de modo que con el mismo
+    modelo toma exactamente las mismas decisiones.
+    """
+    from jugador import JugadorIA, JUGADA_A_NUM, NUM_A_JUGADA
+    from perfiles import Perfil
+
+    cabecera, rondas = leer_traza(ruta)
+    perfil = Perfil.desde_bytes(cabecera["perfil"]) if cabecera["perfil"] else None
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        ia = JugadorIA(ruta_modelo, ruta_tabla=ruta_tabla, semilla=cabecera["semilla"],
+                       politica=cabecera["politica"], umbral=cabecera["umbral"],
+                       perfil=perfil)
+
+    decisiones = np.empty(len(rondas), dtype=np.int8)
+    diferencia_features = 0.0
+    for i, ronda in enumerate(rondas):
+        features = ia.obtener_features_actuales().astype(np.float32)
+        diferencia_features = max(diferencia_features, float(np.abs(features - ronda["features"]).max()))
+
+        decisiones[i] = JUGADA_A_NUM[ia.decidir_jugada()]
+        ia.registrar_ronda(NUM_A_JUGADA[int(ronda["humano"])], NUM_A_JUGADA[int(ronda["ia"])])
+
+    distintas = np.flatnonzero(decisiones != rondas["ia"])
+    return {
+        "rondas": len(rondas),
+        "coincidencias": int(len(rondas) - len(distintas)),
+        "primera_divergencia": int(rondas["ronda"][distintas[0]]) if len(distintas) else None,
+        "diferencia_features": diferencia_features,
+        "huella_grabada": cabecera["huella"],
+        "huella_modelo": ia.huella,
+    }
+
+
+def main():
+    """Funcion principal."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Reproduce una traza de decisiones")
+    parser.add_argument("traza", help="Fichero .rpst a reproducir")
+    parser.add_argument("--modelo", default=None, help="Modelo o paquete contra el que reproducir")
+    parser.add_argument("--tabla", default=None, help="Reproducir contra una tabla destilada")
+    args = parser.parse_args()
+
+    informe = reproducir_traza(args.traza, args.modelo, args.tabla)
+
+    print(f"Rondas: {informe['rondas']}")
+    print(f"Decisiones iguales: {informe['coincidencias']}/{informe['rondas']}")
+    if informe["primera_divergencia"] is not None:
+        print(f"Primera divergencia en la ronda {informe['primera_divergencia']}")
+    print(f"Diferencia maxima de features: {informe['diferencia_features']:.2e}")
+    if informe["huella_grabada"] != informe["huella_modelo"]:
+        print("⚠ El modelo no es el mismo que el de la sesion grabada")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Los modulos viven sueltos en src/, como en los scripts
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
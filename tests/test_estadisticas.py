@@ -0,0 +1,36 @@
+"""Las frecuencias en lote deben coincidir con las del contador en vivo."""
+
+import numpy as np
+import pytest
+
+from estadisticas import ContadorFrecuencias, filtro_exponencial, frecuencias_lote
+
+
+@pytest.mark.parametrize("ventana, decaimiento", [
+    (None, None), (1, None), (5, None), (None, 0.1), (None, 0.9),
+])
+def test_lote_igual_que_en_vivo(ventana, decaimiento):
+    jugadas = np.random.default_rng(0).integers(0, 3, 200)
+
+    contador = ContadorFrecuencias(ventana, decaimiento)
+    en_vivo = []
+    for jugada in jugadas:
+        contador.actualizar(int(jugada))
+        en_vivo.append(contador.frecuencias())
+
+    np.testing.assert_allclose(frecuencias_lote(jugadas, ventana, decaimiento), en_vivo,
+                               rtol=1e-9, atol=1e-12)
+
+
+@pytest.mark.parametrize("decaimiento", [0.001, 0.05, 0.5, 0.99])
+def test_filtro_exponencial_igual_que_bucle(decaimiento):
+    # Mas largo que un bloque para cubrir el paso del estado entre bloques
+    x = np.random.default_rng(1).random((5000, 3))
+
+    esperado = np.empty_like(x)
+    estado = np.zeros(3)
+    for t, fila in enumerate(x):
+        estado = (1 - decaimiento) * estado + decaimiento * fila
+        esperado[t] = estado
+
+    np.testing.assert_allclose(filtro_exponencial(x, decaimiento), esperado, rtol=1e-9, atol=1e-12)
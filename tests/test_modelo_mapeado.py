@@ -0,0 +1,35 @@
+"""Los modelos mapeados deben predecir lo mismo que el modelo de sklearn."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.tree import DecisionTreeClassifier
+
+from modelo_mapeado import cargar_modelo_mapeado, exportar_modelo_mapeado
+
+
+@pytest.fixture
+def datos():
+    rng = np.random.default_rng(0)
+    X = rng.random((400, 11))
+    y = (X[:, 0] * 3).astype(int) ^ (X[:, 5] > 0.5)
+    return X, np.clip(y, 0, 2), rng.random((300, 11))
+
+
+@pytest.mark.parametrize("modelo", [
+    RandomForestClassifier(n_estimators=20, max_depth=8, random_state=0),
+    DecisionTreeClassifier(random_state=0),
+    KNeighborsClassifier(n_neighbors=5),
+])
+def test_predict_proba_igual_que_sklearn(modelo, datos, tmp_path, capsys):
+    X, y, X_prueba = datos
+    modelo.fit(X, y)
+    exportar_modelo_mapeado(modelo, tmp_path)
+    mapeado = cargar_modelo_mapeado(tmp_path)
+
+    np.testing.assert_allclose(mapeado.predict_proba(X_prueba), modelo.predict_proba(X_prueba),
+                               atol=1e-12)
+    np.testing.assert_array_equal(mapeado.predict(X_prueba), modelo.predict(X_prueba))
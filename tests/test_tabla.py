@@ -0,0 +1,33 @@
+"""indice_tabla debe dar la misma celda que discretizar_lote + ravel_multi_index."""
+
+import numpy as np
+import pytest
+
+from jugador import forma_tabla, indice_tabla, NUM_FEATURES
+from modelo import discretizar_lote
+
+
+def features_aleatorias(n, rng):
+    freqs = rng.dirichlet(np.ones(3), n)
+    return np.column_stack([
+        freqs,
+        rng.integers(0, 3, (n, 4)),   # lag1, lag2, lag3, fase
+        rng.integers(-2, 3, n),       # diff
+        rng.integers(-1, 2, n),       # resultado_anterior
+        rng.integers(0, 8, (n, 2)),   # rachas (se recortan a MAX_RACHA_TABLA)
+    ]).astype(float)
+
+
+@pytest.mark.parametrize("resolucion", [4, 10])
+def test_indice_igual_que_ravel(resolucion):
+    X = features_aleatorias(2000, np.random.default_rng(0))
+    esperado = np.ravel_multi_index(discretizar_lote(X, resolucion), forma_tabla(resolucion))
+
+    assert [indice_tabla(f, resolucion) for f in X] == esperado.tolist()
+
+
+def test_indice_sin_features_opcionales():
+    X = features_aleatorias(200, np.random.default_rng(1))[:, :NUM_FEATURES - 3]
+    esperado = np.ravel_multi_index(discretizar_lote(X), forma_tabla())
+
+    assert [indice_tabla(f) for f in X] == esperado.tolist()
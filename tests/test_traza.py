@@ -0,0 +1,55 @@
+"""Reproducir una traza con el mismo modelo debe repetir todas las decisiones."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+from sklearn.ensemble import RandomForestClassifier
+
+from jugador import JugadorIA, NUM_A_JUGADA
+from paquete import guardar_paquete
+from perfiles import Perfil
+from traza import leer_traza, reproducir_traza
+
+
+@pytest.fixture(scope="module")
+def ruta_paquete(tmp_path_factory):
+    rng = np.random.default_rng(0)
+    X = rng.random((300, 11))
+    y = rng.integers(0, 3, 300)
+    ruta = tmp_path_factory.mktemp("modelos") / "paquete"
+    guardar_paquete(RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y), ruta)
+    return ruta
+
+
+def jugar(ia, ruta_traza, rondas=60):
+    rng = np.random.default_rng(1)
+    ia.iniciar_traza(ruta_traza)
+    for _ in range(rondas):
+        jugada_ia = ia.decidir_jugada()
+        ia.registrar_ronda(NUM_A_JUGADA[int(rng.integers(0, 3))], jugada_ia)
+    ia.cerrar_traza()
+
+
+@pytest.mark.parametrize("politica, umbral, perfil", [
+    ("esperada", 0.45, None),
+    ("esperada", 0.0, None),
+    ("argmax", 0.45, None),
+    ("esperada", 0.45, Perfil.desde_sesion(["piedra", "papel", "piedra", "tijera"] * 5,
+                                           ["papel"] * 20)),
+])
+def test_reproduccion_determinista(ruta_paquete, tmp_path, politica, umbral, perfil):
+    ruta_traza = tmp_path / f"{politica}-{umbral}-{perfil is not None}.rpst"
+    jugar(JugadorIA(str(ruta_paquete), politica=politica, umbral=umbral, perfil=perfil),
+          ruta_traza)
+
+    cabecera, rondas = leer_traza(ruta_traza)
+    assert len(rondas) == 60
+    assert (cabecera["perfil"] is not None) == (perfil is not None)
+    assert cabecera["huella"] is not None
+
+    resultado = reproducir_traza(ruta_traza, str(ruta_paquete))
+    assert resultado["coincidencias"] == resultado["rondas"]
+    assert resultado["primera_divergencia"] is None
+    assert resultado["diferencia_features"] == 0.0
+    assert resultado["huella_modelo"] == resultado["huella_grabada"] == cabecera["huella"]